@@ -1,4 +1,5 @@
 import os
+import time
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -18,7 +19,29 @@ from utils import (
     save_study_session,
     save_progress,
     save_settings,
-    save_timer_session
+    save_timer_session,
+    get_study_streak,
+    record_question_attempt,
+    set_lectures_watched
+)
+from config import MOCK_TEST_SECTIONS, PAGE_SIZES, PRACTICE_SET_SIZE
+from db import connect, transaction
+from dashboard import get_dashboard_snapshot, invalidate_dashboard_snapshot
+from data_import import IMPORTERS, import_file
+from migrations import migrate, reset_schema
+from spaced_repetition import GRADES, due_cards, due_count, record_review
+from practice import build_practice_set, fetch_questions
+from mock_test import MockTest, finish_test
+from lecture_catalog import empty_catalog, load_catalog, sync_catalog, with_watched_status
+from rollups import rebuild_study_streak, rebuild_note_tags
+from timer_engine import load_settings, save_timer_settings
+from timer_ui import CLOCK_SKEW_SECONDS, countdown
+from queries import (
+    flashcards_query,
+    practice_questions_query,
+    notes_query,
+    lectures_query,
+    LECTURE_SORT_ORDERS
 )
 
 # Import the minimal timer with analysis
@@ -56,71 +79,28 @@ st.set_page_config(
 #         st.error(f"Error initializing Google Sheets: {str(e)}")
 #         return None
 
+@st.cache_resource(show_spinner=False)
+def bootstrap_db():
+    """Create or upgrade the schema once per server process"""
+    return migrate()
+
 # Enhanced Database initialization
 def init_db(reset=False):
-    conn = sqlite3.connect('cat_prep.db')
-    c = conn.cursor()
-
     # Drop all tables if reset is True
     if reset:
-        # Get all table names from the database
-        c.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = [table[0] for table in c.fetchall()]
-
-        # Drop all tables
-        for table in tables:
-            c.execute(f"DROP TABLE IF EXISTS {table}")
-
-        conn.commit()
+        conn = connect()
+        reset_schema(conn)
+        conn.close()
+
+        # Forget the cached bootstrap so the schema is rebuilt below, and the
+        # dashboard figures computed from the old data
+        bootstrap_db.clear()
+        invalidate_dashboard_snapshot()
         st.success("All data has been reset to zero!")
 
-    # Progress tracking table
-    c.execute('''CREATE TABLE IF NOT EXISTS progress
-                 (date TEXT, section TEXT, topic TEXT, subtopic TEXT, score REAL)''')
-
-    # Study log table - Ensure the date column exists
-    # First check if the table exists
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='study_log'")
-    if c.fetchone() is None:
-        # Create the table with the correct schema
-        c.execute('''CREATE TABLE IF NOT EXISTS study_log
-                     (date TEXT, topic TEXT, subtopic TEXT, time_spent INTEGER, notes TEXT)''')
-    else:
-        # Check if the date column exists
-        c.execute("PRAGMA table_info(study_log)")
-        columns = [info[1] for info in c.fetchall()]
-        if 'date' not in columns:
-            # Add the date column if it doesn't exist
-            c.execute("ALTER TABLE study_log ADD COLUMN date TEXT")
-        if 'subtopic' not in columns:
-            # Add the subtopic column if it doesn't exist
-            c.execute("ALTER TABLE study_log ADD COLUMN subtopic TEXT")
-
-    # Flashcards table
-    c.execute('''CREATE TABLE IF NOT EXISTS flashcards
-                 (word TEXT, definition TEXT, usage TEXT, category TEXT, mastered BOOLEAN, date TEXT)''')
-
-    # Questions table
-    c.execute('''CREATE TABLE IF NOT EXISTS questions
-                 (date TEXT, question TEXT, answer TEXT, topic TEXT, difficulty TEXT, correct INTEGER DEFAULT 0)''')
-
-    # Notes table
-    c.execute('''CREATE TABLE IF NOT EXISTS notes
-                 (date TEXT, title TEXT, content TEXT, tags TEXT)''')
-
-    # Productivity settings table
-    c.execute('''CREATE TABLE IF NOT EXISTS productivity_settings
-                 (user_id TEXT, focus_duration INTEGER DEFAULT 25, break_duration INTEGER DEFAULT 5,
-                  reminder_frequency TEXT, notification_enabled BOOLEAN DEFAULT 0,
-                  daily_goal INTEGER DEFAULT 120, reminder_time TEXT DEFAULT '09:00')''')
-
-    # Timer logs table
-    c.execute('''CREATE TABLE IF NOT EXISTS timer_logs
-                 (date TEXT, start_time TEXT, end_time TEXT, duration INTEGER,
-                  completed BOOLEAN, topic TEXT)''')
-
-    conn.commit()
-    return conn
+    # Cheap after the first call: the cached bootstrap has already run
+    bootstrap_db()
+    return connect()
 
 def show_dashboard():
     # Create a modern header with gradient background and CAT logo
@@ -301,97 +281,17 @@ def show_dashboard():
     # We'll use these columns for the backend calculations, but display using custom HTML
     col1, col2, col3, col4 = st.columns(4)
 
-    # Get actual metrics from database with error handling
-    # Count watched lectures
-    try:
-        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='videos'")
-        if c.fetchone():
-            try:
-                c.execute("SELECT COUNT(*) FROM videos WHERE watched = 1")
-                watched_lectures = c.fetchone()[0] or 0
-                c.execute("SELECT COUNT(*) FROM videos")
-                total_lectures = c.fetchone()[0] or 1  # Avoid division by zero
-            except sqlite3.OperationalError:
-                # If watched column doesn't exist
-                c.execute("SELECT COUNT(*) FROM videos")
-                total_lectures = c.fetchone()[0] or 0
-                watched_lectures = 0
-        else:
-            total_lectures = 0
-            watched_lectures = 0
-    except sqlite3.OperationalError:
-        total_lectures = 0
-        watched_lectures = 0
-
-    lecture_percentage = round((watched_lectures / total_lectures) * 100) if total_lectures > 0 else 0
-
-    # Count mastered flashcards with error handling
-    try:
-        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='flashcards'")
-        if c.fetchone():
-            c.execute("SELECT COUNT(*) FROM flashcards WHERE mastered = 1")
-            mastered_count = c.fetchone()[0] or 0
-            c.execute("SELECT COUNT(*) FROM flashcards")
-            total_flashcards = c.fetchone()[0] or 1  # Avoid division by zero
-        else:
-            mastered_count = 0
-            total_flashcards = 0
-    except sqlite3.OperationalError:
-        mastered_count = 0
-        total_flashcards = 0
-
-    mastery_percentage = round((mastered_count / total_flashcards) * 100) if total_flashcards > 0 else 0
-
-    # Count practice questions with error handling
-    try:
-        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='questions'")
-        if c.fetchone():
-            c.execute("SELECT COUNT(*) FROM questions WHERE correct = 1")
-            correct_count = c.fetchone()[0] or 0
-            c.execute("SELECT COUNT(*) FROM questions")
-            total_questions = c.fetchone()[0] or 1  # Avoid division by zero
-        else:
-            correct_count = 0
-            total_questions = 0
-    except sqlite3.OperationalError:
-        correct_count = 0
-        total_questions = 0
-
-    question_percentage = round((correct_count / total_questions) * 100) if total_questions > 0 else 0
-
-    # Calculate study hours with error handling
-    try:
-        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='study_log'")
-        if c.fetchone():
-            c.execute("SELECT SUM(time_spent) FROM study_log")
-            minutes = c.fetchone()[0] or 0
-
-            # Get today's study time
-            today = datetime.now().strftime('%Y-%m-%d')
-            c.execute("SELECT SUM(time_spent) FROM study_log WHERE date = ?", (today,))
-            today_minutes = c.fetchone()[0] or 0
-        else:
-            minutes = 0
-            today_minutes = 0
-    except sqlite3.OperationalError:
-        minutes = 0
-        today_minutes = 0
-
-    study_hours = round(minutes / 60, 1)
-
-    # Get yesterday's study time for delta with error handling
-    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
-    try:
-        c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='study_log'")
-        if c.fetchone():
-            c.execute("SELECT SUM(time_spent) FROM study_log WHERE date = ?", (yesterday,))
-            yesterday_minutes = c.fetchone()[0] or 0
-        else:
-            yesterday_minutes = 0
-    except sqlite3.OperationalError:
-        yesterday_minutes = 0
-
-    today_delta = today_minutes - yesterday_minutes
+    # All headline metrics come from one cached snapshot (see dashboard.py)
+    snapshot = get_dashboard_snapshot()
+    watched_lectures, total_lectures = snapshot.watched_lectures, snapshot.total_lectures
+    lecture_percentage = snapshot.lecture_percentage
+    mastered_count, total_flashcards = snapshot.mastered_flashcards, snapshot.total_flashcards
+    mastery_percentage = snapshot.mastery_percentage
+    correct_count, total_questions = snapshot.correct_attempts, snapshot.total_attempts
+    question_percentage = snapshot.question_percentage
+    study_hours = snapshot.study_hours
+    today_minutes = snapshot.today_minutes
+    today_delta = snapshot.today_delta
 
     # Display metrics with modern card design
     # Lectures card
@@ -453,57 +353,14 @@ def show_dashboard():
     # Summary Statistics - Second row
     col1, col2, col3, col4 = st.columns(4)
 
-    # Get study streak
-    c.execute("""
-        SELECT date FROM study_log
-        GROUP BY date
-        ORDER BY date DESC
-    """)
-    dates = [row[0] for row in c.fetchall()]
-
-    current_streak = 0
-    if dates:
-        current_date = datetime.strptime(dates[0], '%Y-%m-%d').date()
-        expected_date = datetime.now().date()
-
-        # Check if the most recent study date is today or yesterday
-        if current_date >= expected_date - timedelta(days=1):
-            current_streak = 1
-            for i in range(1, len(dates)):
-                prev_date = datetime.strptime(dates[i], '%Y-%m-%d').date()
-                if (current_date - prev_date).days == 1:
-                    current_streak += 1
-                    current_date = prev_date
-                else:
-                    break
-
-    # Get total study days
-    c.execute("SELECT COUNT(DISTINCT date) FROM study_log")
-    study_days = c.fetchone()[0] or 0
+    # Streak state is maintained as sessions are logged (see rollups.py)
+    current_streak = snapshot.current_streak
 
-    # Get section with highest score
-    c.execute("""
-        SELECT section, AVG(score) as avg_score
-        FROM progress
-        GROUP BY section
-        ORDER BY avg_score DESC
-        LIMIT 1
-    """)
-    best_section_data = c.fetchone()
-    best_section = best_section_data[0] if best_section_data else "N/A"
-    best_score = round(best_section_data[1], 1) if best_section_data else 0
-
-    # Get section with lowest score
-    c.execute("""
-        SELECT section, AVG(score) as avg_score
-        FROM progress
-        GROUP BY section
-        ORDER BY avg_score ASC
-        LIMIT 1
-    """)
-    weakest_section_data = c.fetchone()
-    weakest_section = weakest_section_data[0] if weakest_section_data else "N/A"
-    weakest_score = round(weakest_section_data[1], 1) if weakest_section_data else 0
+    # Get sections with the highest and lowest average score
+    best_section, best_score = snapshot.best_section or ("N/A", 0)
+    best_score = round(best_score, 1)
+    weakest_section, weakest_score = snapshot.weakest_section or ("N/A", 0)
+    weakest_score = round(weakest_score, 1)
 
     with col1:
         st.metric("Total Study Hours", f"{study_hours}")
@@ -523,13 +380,8 @@ def show_dashboard():
 
         with col1:
             st.subheader("Section-wise Progress")
-            # Get progress data
-            c.execute("""
-                SELECT section, AVG(score) as avg_score
-                FROM progress
-                GROUP BY section
-            """)
-            progress_data = c.fetchall()
+            # Section averages are already part of the snapshot
+            progress_data = list(snapshot.section_scores)
 
             if progress_data:
                 df_progress = pd.DataFrame(progress_data, columns=['Section', 'Average Score'])
@@ -596,8 +448,8 @@ def show_dashboard():
             st.subheader("Study Time by Day")
             # Get study time by day of week
             c.execute("""
-                SELECT date, SUM(time_spent) as daily_time
-                FROM study_log
+                SELECT date, SUM(total_minutes) as daily_time
+                FROM daily_study_rollup
                 GROUP BY date
                 ORDER BY date
             """)
@@ -632,8 +484,8 @@ def show_dashboard():
             st.subheader("Topic Distribution")
             # Get study time by topic
             c.execute("""
-                SELECT topic, SUM(time_spent) as total_time
-                FROM study_log
+                SELECT topic, SUM(total_minutes) as total_time
+                FROM daily_study_rollup
                 GROUP BY topic
             """)
             topic_data = c.fetchall()
@@ -782,11 +634,7 @@ def show_dashboard():
         except sqlite3.OperationalError:
             total_study_minutes = 0
 
-        try:
-            c.execute("SELECT COUNT(*) FROM videos WHERE watched = 1")
-            watched_lectures = c.fetchone()[0] or 0
-        except sqlite3.OperationalError:
-            watched_lectures = 0
+        watched_lectures = snapshot.watched_lectures
 
         try:
             c.execute("SELECT COUNT(*) FROM flashcards")
@@ -1156,6 +1004,54 @@ def show_recent_activity(conn, c):
         </div></div>
         """, unsafe_allow_html=True)
 
+def paginate(c, query, key):
+    """
+    Show one keyset-paginated page of a query with page-size and Previous/Next controls.
+
+    The query's first column must be the id. Pages are fetched with
+    id > last id seen, so every page costs the same however deep it is.
+    The start id of each visited page is kept in session state, and the
+    position resets whenever the filters (and so the count query) change.
+    Returns the rows of the current page.
+    """
+    count_sql, count_params = query.build_count()
+    c.execute(count_sql, count_params)
+    total = c.fetchone()[0] or 0
+
+    # Start over when the filters change
+    signature = (count_sql, count_params)
+    if st.session_state.get(f"{key}_signature") != signature:
+        st.session_state[f"{key}_signature"] = signature
+        st.session_state[f"{key}_starts"] = [0]
+    starts = st.session_state[f"{key}_starts"]
+
+    col1, col2, col3, col4 = st.columns([2, 3, 1, 1])
+    with col1:
+        page_size = st.selectbox("Per page", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    if st.session_state.get(f"{key}_last_page_size") != page_size:
+        st.session_state[f"{key}_last_page_size"] = page_size
+        starts[:] = [0]
+
+    c.execute(*query.page(starts[-1], page_size).build())
+    rows = c.fetchall()
+
+    first = (len(starts) - 1) * page_size
+    with col2:
+        if total:
+            st.markdown(f"**{first + 1}–{first + len(rows)} of {total}**")
+        else:
+            st.markdown("**0 results**")
+    with col3:
+        if st.button("◀ Previous", key=f"{key}_previous", disabled=len(starts) == 1):
+            starts.pop()
+            st.rerun()
+    with col4:
+        if st.button("Next ▶", key=f"{key}_next", disabled=first + len(rows) >= total):
+            starts.append(rows[-1][0])
+            st.rerun()
+
+    return rows
+
 def show_flashcards():
     st.title("Flashcards")
 
@@ -1190,95 +1086,55 @@ def show_flashcards():
 
 def show_flashcard_review(conn, c):
     # Filter options
-    col1, col2 = st.columns(2)
-    with col1:
-        category_filter = st.selectbox(
-            "Filter by Category",
-            ["All", "VARC", "DILR", "Quant"]
-        )
-    with col2:
-        mastery_filter = st.selectbox(
-            "Filter by Mastery",
-            ["All", "Mastered", "Not Mastered"]
-        )
-
-    # Check if the flashcards table has the necessary columns
-    c.execute("PRAGMA table_info(flashcards)")
-    columns = [info[1] for info in c.fetchall()]
-
-    # If the table doesn't have the required columns, create some sample flashcards
-    if 'word' not in columns or 'definition' not in columns or 'usage' not in columns or 'category' not in columns or 'mastered' not in columns:
-        st.warning("Flashcards table doesn't have the required columns. Creating sample flashcards.")
-
-        # Drop the existing table if it exists but has wrong schema
-        c.execute("DROP TABLE IF EXISTS flashcards")
-        conn.commit()
-
-        # Create the table with the correct schema
-        c.execute('''CREATE TABLE IF NOT EXISTS flashcards
-                     (word TEXT, definition TEXT, usage TEXT, category TEXT, mastered BOOLEAN, date TEXT DEFAULT CURRENT_DATE)''')
-        conn.commit()
-
-        # Add some sample flashcards
-        sample_flashcards = [
-            ("Amalgamate", "To combine or unite to form one organization or structure", "The two companies decided to amalgamate to increase their market share.", "VARC", False, datetime.now().strftime('%Y-%m-%d')),
-            ("Ephemeral", "Lasting for a very short time", "The beauty of cherry blossoms is ephemeral, lasting only a few days each year.", "VARC", False, datetime.now().strftime('%Y-%m-%d')),
-            ("Permutation", "Each of several possible ways in which a set or number of things can be ordered or arranged", "There are 6 permutations of the 3 letters A, B, and C.", "DILR", True, datetime.now().strftime('%Y-%m-%d')),
-            ("Quadratic", "Involving the square (and no higher power) of an unknown quantity or variable", "The quadratic equation ax² + bx + c = 0 has two solutions.", "Quant", True, datetime.now().strftime('%Y-%m-%d'))
-        ]
-
-        c.executemany("INSERT INTO flashcards (word, definition, usage, category, mastered, date) VALUES (?, ?, ?, ?, ?, ?)", sample_flashcards)
-        conn.commit()
-
-    # Build query based on filters
-    query = "SELECT word, definition, usage, category, mastered FROM flashcards"
-    conditions = []
+    category_filter = st.selectbox(
+        "Filter by Category",
+        ["All", "VARC", "DILR", "Quant"]
+    )
 
-    if category_filter != "All":
-        conditions.append(f"category = '{category_filter}'")
-    if mastery_filter != "All":
-        conditions.append(f"mastered = {1 if mastery_filter == 'Mastered' else 0}")
+    # Only the card shown is loaded, straight from the due_at index; grading it
+    # reruns the page for the next one
+    due = due_cards(c, category_filter, limit=1)
+    total_due = due_count(c, category_filter)
 
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
+    if due:
+        st.caption(f"{total_due} card{'s' if total_due != 1 else ''} due for review")
+        card_id, word, definition, usage, category, ease, interval_days, repetitions, due_at = due[0]
 
-    try:
-        c.execute(query)
-        flashcards = c.fetchall()
-    except sqlite3.OperationalError as e:
-        st.error(f"Database error: {e}")
-        st.info("Creating sample flashcards for demonstration.")
-
-        # Create sample flashcards for display
-        flashcards = [
-            ("Amalgamate", "To combine or unite to form one organization or structure", "The two companies decided to amalgamate to increase their market share.", "VARC", False),
-            ("Ephemeral", "Lasting for a very short time", "The beauty of cherry blossoms is ephemeral, lasting only a few days each year.", "VARC", False),
-            ("Permutation", "Each of several possible ways in which a set or number of things can be ordered or arranged", "There are 6 permutations of the 3 letters A, B, and C.", "DILR", True),
-            ("Quadratic", "Involving the square (and no higher power) of an unknown quantity or variable", "The quadratic equation ax² + bx + c = 0 has two solutions.", "Quant", True)
-        ]
+        with st.container():
+            st.markdown(f"### {word}")
+            st.caption(f"{category} · reviewed {repetitions} time{'s' if repetitions != 1 else ''} in a row")
 
-    # Display flashcards
-    if flashcards:
-        for i, (word, definition, usage, category, mastered) in enumerate(flashcards):
-            with st.expander(f"{word} ({category})", expanded=False):
+            # Reveal the answer before grading
+            reveal_key = f"reveal_card_{card_id}"
+            if not st.session_state.get(reveal_key):
+                if st.button("Show Answer", key=f"show_card_{card_id}"):
+                    st.session_state[reveal_key] = True
+                    st.rerun()
+            else:
                 st.markdown(f"**Definition:** {definition}")
                 if usage:
                     st.markdown(f"**Usage:** {usage}")
 
-                col1, col2 = st.columns([4, 1])
-                with col2:
-                    # Toggle mastery status
-                    current_status = "Mastered" if mastered else "Not Mastered"
-                    new_status = "Not Mastered" if mastered else "Mastered"
-                    if st.button(f"Mark as {new_status}", key=f"toggle_{i}"):
-                        c.execute(
-                            "UPDATE flashcards SET mastered = ? WHERE word = ?",
-                            (not mastered, word)
-                        )
-                        conn.commit()
-                        st.rerun()
+                st.markdown("**How well did you remember it?**")
+                grade_cols = st.columns(len(GRADES))
+                for col, (label, grade) in zip(grade_cols, GRADES.items()):
+                    with col:
+                        if st.button(label, key=f"grade_{label}_{card_id}", use_container_width=True):
+                            with transaction() as review_conn:
+                                record_review(review_conn.cursor(), card_id, grade)
+                            st.session_state.pop(reveal_key, None)
+                            st.rerun()
     else:
-        st.info("No flashcards found. Add some flashcards to get started!")
+        st.success("No cards are due right now. Add more flashcards or come back later!")
+
+    # Browse the whole deck, one keyset page at a time
+    st.subheader("All Flashcards")
+    for card_id, word, definition, usage, category, mastered, due_at in paginate(c, flashcards_query(category_filter), "flashcards"):
+        with st.expander(f"{word} ({category})", expanded=False):
+            st.markdown(f"**Definition:** {definition}")
+            if usage:
+                st.markdown(f"**Usage:** {usage}")
+            st.caption(f"{'Mastered · ' if mastered else ''}Next review: {due_at}")
 
     # Statistics
     st.subheader("Review Statistics")
@@ -1308,8 +1164,8 @@ def show_question_bank():
     conn = init_db()
     c = conn.cursor()
 
-    # Create tabs for Add and Practice
-    tab1, tab2 = st.tabs(["Add Question", "Practice Questions"])
+    # Create tabs for Add, Practice and Mock Test
+    tab1, tab2, tab3 = st.tabs(["Add Question", "Practice Questions", "Mock Test"])
 
     with tab1:
         st.header("Add New Question")
@@ -1330,9 +1186,101 @@ def show_question_bank():
         st.header("Practice Questions")
         show_practice_questions(conn, c)
 
+    with tab3:
+        st.header("Mock Test")
+        show_mock_test(c)
+
     # Close database connection
     conn.close()
 
+def show_mock_test(c):
+    """A timed VARC/DILR/Quant paper from the question bank, one question at a time"""
+    test = st.session_state.get("mock_test")
+
+    if test is None:
+        st.write("Sit a full paper drawn from your question bank: "
+                 + ", ".join(f"{section} ({count} questions, {minutes} min)"
+                             for section, (count, minutes) in MOCK_TEST_SECTIONS.items()) + ".")
+        st.caption("Mark each answer yourself after checking the solution. "
+                   "Scoring follows CAT marking: +3 correct, -1 incorrect, 0 skipped.")
+        if st.button("Start Mock Test"):
+            test = MockTest.start(c)
+            if test.finished:
+                st.warning("The question bank has no questions for any section yet.")
+            else:
+                st.session_state.mock_test = test
+                st.rerun()
+        return
+
+    test.check_time()
+    if test.finished:
+        # Attempts and sectional scores are saved together, once
+        if "mock_test_scores" not in st.session_state:
+            st.session_state.mock_test_scores = finish_test(test)
+        scores = st.session_state.mock_test_scores
+
+        st.success("Mock test complete. Sectional scores were added to your progress.")
+        cols = st.columns(len(scores))
+        for col, (section, score) in zip(cols, scores.items()):
+            result = test.results[section]
+            with col:
+                st.metric(section, f"{score}%")
+                st.caption(f"{result.correct} correct · {result.incorrect} incorrect · {result.skipped} skipped")
+        if st.button("New Mock Test"):
+            del st.session_state.mock_test
+            del st.session_state.mock_test_scores
+            st.rerun()
+        return
+
+    section = test.current_section
+    question_id, date, question, answer, topic, difficulty, correct = test.current_question
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        st.subheader(f"{section} · Question {test.question_index + 1} of {len(test.paper[section])}")
+    with col2:
+        st.caption("Time left")
+        # Ticks in the browser and reruns the page once the section's time is up
+        run = f"{test.section_index}:{test.section_started_at:.6f}"
+        if countdown(run, test.time_left(), test.minutes[section] * 60, f"{section} section",
+                     compact=True, key="mock_test_countdown"):
+            # Close the section on the browser's zero, within the usual clock skew
+            if test.check_time(time.time() + CLOCK_SKEW_SECONDS):
+                st.rerun()
+    with col3:
+        st.metric("Section", f"{test.section_index + 1} of {len(test.sections)}")
+    st.progress(test.question_index / len(test.paper[section]))
+
+    st.markdown(f"**Question:** {question}")
+    st.caption(f"Difficulty: {difficulty}")
+    if st.checkbox("Show solution", key=f"mock_solution_{section}_{question_id}"):
+        st.markdown(f"**Answer:** {answer}")
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        if st.button("✓ Got it right", key="mock_correct"):
+            test.answer("correct")
+            st.rerun()
+    with col2:
+        if st.button("✗ Got it wrong", key="mock_incorrect"):
+            test.answer("incorrect")
+            st.rerun()
+    with col3:
+        if st.button("Skip", key="mock_skip"):
+            test.answer("skip")
+            st.rerun()
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if st.button("End Section", key="mock_end_section"):
+            test.end_section()
+            st.rerun()
+    with col2:
+        if st.button("Finish Test", key="mock_finish"):
+            while not test.finished:
+                test.end_section()
+            st.rerun()
+
 def show_practice_questions(conn, c):
     # Filter options
     col1, col2 = st.columns(2)
@@ -1364,50 +1312,52 @@ def show_practice_questions(conn, c):
         ]
         c.executemany("INSERT INTO questions (date, question, answer, topic, difficulty, correct) VALUES (?, ?, ?, ?, ?, ?)", sample_questions)
         conn.commit()
-    else:
-        # Check if the correct column exists
-        c.execute("PRAGMA table_info(questions)")
-        columns = [info[1] for info in c.fetchall()]
-        if 'correct' not in columns:
-            # Add the correct column if it doesn't exist
-            c.execute("ALTER TABLE questions ADD COLUMN correct INTEGER DEFAULT 0")
-            conn.commit()
-
-    # Build query based on filters
-    query = "SELECT date, question, answer, topic, difficulty, correct FROM questions"
-    conditions = []
-
-    if topic_filter != "All":
-        conditions.append(f"topic = '{topic_filter}'")
-    if difficulty_filter != "All":
-        conditions.append(f"difficulty = '{difficulty_filter}'")
 
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
+    mode = st.radio("Practice mode", ["Browse all", "Adaptive set"], horizontal=True,
+                    help="An adaptive set favours your weakest sections and recently missed questions")
 
     try:
-        c.execute(query)
-        questions = c.fetchall()
+        if mode == "Adaptive set":
+            col1, col2, col3 = st.columns([1, 1, 1])
+            with col1:
+                set_size = st.number_input("Questions", min_value=1, max_value=50, value=PRACTICE_SET_SIZE)
+            with col2:
+                time_budget = st.number_input("Time budget (minutes, 0 = none)", min_value=0, value=0, step=5)
+            with col3:
+                st.write("")
+                if st.button("Build Practice Set"):
+                    practice_set = build_practice_set(c, set_size, time_budget or None,
+                                                      topic_filter, difficulty_filter)
+                    st.session_state.practice_set_ids = [row[0] for row in practice_set]
+
+            # Re-read the chosen questions so marking one updates its status
+            questions = fetch_questions(c, st.session_state.get("practice_set_ids", []))
+        else:
+            # Build a parameterized query based on filters
+            query = practice_questions_query(topic_filter, difficulty_filter)
+
+            # One keyset page at a time keeps the widget count flat as the bank grows
+            questions = paginate(c, query, "practice_questions")
     except sqlite3.OperationalError as e:
         st.error(f"Database error: {e}")
         st.info("Creating sample questions for demonstration.")
 
         # Create sample questions for display
         questions = [
-            (datetime.now().strftime('%Y-%m-%d'), 'What is the value of x in the equation 2x + 5 = 15?', 'x = 5', 'Quant', 'Easy', 1),
-            (datetime.now().strftime('%Y-%m-%d'), 'If a train travels at 60 km/h, how long will it take to cover 150 km?', '2.5 hours', 'Quant', 'Medium', 0),
-            (datetime.now().strftime('%Y-%m-%d'), 'Identify the logical fallacy in the following argument...', 'This is an example of a straw man fallacy...', 'VARC', 'Hard', 0),
-            (datetime.now().strftime('%Y-%m-%d'), 'Analyze the given data set and find the trend...', 'The trend shows an increasing pattern...', 'DILR', 'Medium', 1)
+            (1, datetime.now().strftime('%Y-%m-%d'), 'What is the value of x in the equation 2x + 5 = 15?', 'x = 5', 'Quant', 'Easy', 1),
+            (2, datetime.now().strftime('%Y-%m-%d'), 'If a train travels at 60 km/h, how long will it take to cover 150 km?', '2.5 hours', 'Quant', 'Medium', 0),
+            (3, datetime.now().strftime('%Y-%m-%d'), 'Identify the logical fallacy in the following argument...', 'This is an example of a straw man fallacy...', 'VARC', 'Hard', 0),
+            (4, datetime.now().strftime('%Y-%m-%d'), 'Analyze the given data set and find the trend...', 'The trend shows an increasing pattern...', 'DILR', 'Medium', 1)
         ]
 
     # Display questions
     if questions:
-        for i, (date, question, answer, topic, difficulty, correct) in enumerate(questions):
+        for question_id, date, question, answer, topic, difficulty, correct in questions:
             with st.expander(f"{topic} - {difficulty} - {date}", expanded=False):
                 st.markdown(f"**Question:** {question}")
 
                 # Show/hide answer with a button
-                if st.button("Show Answer", key=f"show_answer_{i}"):
+                if st.button("Show Answer", key=f"show_answer_{question_id}"):
                     st.markdown(f"**Answer:** {answer}")
 
                 # Question metadata
@@ -1420,24 +1370,20 @@ def show_practice_questions(conn, c):
                     status = "Correct" if correct else "Incorrect"
                     st.write(f"Status: {status}")
 
-                # Mark as correct/incorrect
+                # Record an attempt as correct/incorrect
+                time_taken = st.number_input("Time taken (seconds, optional)", min_value=0, value=0, step=10,
+                                             key=f"time_taken_{question_id}")
                 col1, col2 = st.columns([1, 1])
                 with col1:
-                    if st.button("Mark as Correct", key=f"correct_{i}"):
-                        c.execute(
-                            "UPDATE questions SET correct = 1 WHERE question = ?",
-                            (question,)
-                        )
-                        conn.commit()
+                    if st.button("Mark as Correct", key=f"correct_{question_id}"):
+                        record_question_attempt(question_id, True, time_taken or None)
                         st.rerun()
                 with col2:
-                    if st.button("Mark as Incorrect", key=f"incorrect_{i}"):
-                        c.execute(
-                            "UPDATE questions SET correct = 0 WHERE question = ?",
-                            (question,)
-                        )
-                        conn.commit()
+                    if st.button("Mark as Incorrect", key=f"incorrect_{question_id}"):
+                        record_question_attempt(question_id, False, time_taken or None)
                         st.rerun()
+    elif mode == "Adaptive set" and not st.session_state.get("practice_set_ids"):
+        st.info("Choose a size and time budget, then build a practice set.")
     else:
         st.info("No questions found. Add some questions to get started!")
 
@@ -1513,13 +1459,14 @@ def show_notes_list(conn, c):
             (datetime.now().strftime('%Y-%m-%d'), 'Data Interpretation Tips', 'When approaching DI sets:\n\n1. Understand what each graph/table represents\n2. Identify the units of measurement\n3. Look for patterns and trends\n4. Calculate key values before starting questions\n5. Double-check calculations', 'DILR, Tips')
         ]
         c.executemany("INSERT INTO notes (date, title, content, tags) VALUES (?, ?, ?, ?)", sample_notes)
+        rebuild_note_tags(c)
         conn.commit()
 
     # Search and filter options
     col1, col2 = st.columns(2)
 
     with col1:
-        search_term = st.text_input("Search notes", "")
+        search_term = st.text_input("Search notes", "", help="Matches whole words and word prefixes, best matches first")
 
     with col2:
         tag_filter = st.multiselect(
@@ -1528,24 +1475,11 @@ def show_notes_list(conn, c):
             []
         )
 
-    # Build query based on search and filters
-    query = "SELECT date, title, content, tags FROM notes"
-    conditions = []
-
-    if search_term:
-        conditions.append(f"(title LIKE '%{search_term}%' OR content LIKE '%{search_term}%')")
-
-    if tag_filter:
-        tag_conditions = [f"tags LIKE '%{tag}%'" for tag in tag_filter]
-        conditions.append("(" + " OR ".join(tag_conditions) + ")")
-
-    if conditions:
-        query += " WHERE " + " AND ".join(conditions)
-
-    query += " ORDER BY date DESC"
+    # Build a parameterized query based on search and tag filters
+    query = notes_query(search_term, tag_filter)
 
     try:
-        c.execute(query)
+        c.execute(*query.build())
         notes = c.fetchall()
     except sqlite3.OperationalError as e:
         st.error(f"Database error: {e}")
@@ -1553,14 +1487,17 @@ def show_notes_list(conn, c):
 
         # Create sample notes for display
         notes = [
-            (datetime.now().strftime('%Y-%m-%d'), 'Reading Comprehension Strategies', 'Here are some effective strategies for RC passages:\n\n1. Skim the passage first\n2. Read the questions before detailed reading\n3. Look for transition words\n4. Pay attention to the first and last sentences of each paragraph\n5. Practice active reading by asking questions', 'VARC, Tips'),
-            (datetime.now().strftime('%Y-%m-%d'), 'Important Quant Formulas', 'Key formulas to remember:\n\n1. Quadratic equation: ax² + bx + c = 0\n2. Compound interest: A = P(1 + r/n)^(nt)\n3. Permutation: nPr = n!/(n-r)!\n4. Combination: nCr = n!/[r!(n-r)!]\n5. Area of triangle: (1/2) × base × height', 'Quant, Formulas, Important'),
-            (datetime.now().strftime('%Y-%m-%d'), 'Data Interpretation Tips', 'When approaching DI sets:\n\n1. Understand what each graph/table represents\n2. Identify the units of measurement\n3. Look for patterns and trends\n4. Calculate key values before starting questions\n5. Double-check calculations', 'DILR, Tips')
+            (datetime.now().strftime('%Y-%m-%d'), 'Reading Comprehension Strategies', 'Here are some effective strategies for RC passages:\n\n1. Skim the passage first\n2. Read the questions before detailed reading\n3. Look for transition words\n4. Pay attention to the first and last sentences of each paragraph\n5. Practice active reading by asking questions', 'VARC, Tips', None),
+            (datetime.now().strftime('%Y-%m-%d'), 'Important Quant Formulas', 'Key formulas to remember:\n\n1. Quadratic equation: ax² + bx + c = 0\n2. Compound interest: A = P(1 + r/n)^(nt)\n3. Permutation: nPr = n!/(n-r)!\n4. Combination: nCr = n!/[r!(n-r)!]\n5. Area of triangle: (1/2) × base × height', 'Quant, Formulas, Important', None),
+            (datetime.now().strftime('%Y-%m-%d'), 'Data Interpretation Tips', 'When approaching DI sets:\n\n1. Understand what each graph/table represents\n2. Identify the units of measurement\n3. Look for patterns and trends\n4. Calculate key values before starting questions\n5. Double-check calculations', 'DILR, Tips', None)
         ]
 
     # Display notes
     if notes:
-        for i, (date, title, content, tags) in enumerate(notes):
+        for i, (date, title, content, tags, snippet) in enumerate(notes):
+            # Show where the search matched, highlighted
+            if snippet:
+                st.caption(snippet)
             with st.expander(f"{title} - {date}", expanded=False):
                 st.markdown(content)
                 st.markdown(f"**Tags:** {tags}")
@@ -1750,8 +1687,8 @@ def show_progress_trends():
 
     # Get study log data
     c.execute("""
-        SELECT date, SUM(time_spent) as daily_time
-        FROM study_log
+        SELECT date, SUM(total_minutes) as daily_time
+        FROM daily_study_rollup
         WHERE date BETWEEN ? AND ?
         GROUP BY date
         ORDER BY date
@@ -1832,14 +1769,6 @@ def show_topic_analysis():
         ]
         c.executemany("INSERT INTO progress (date, section, topic, subtopic, score) VALUES (?, ?, ?, ?, ?)", sample_data)
         conn.commit()
-    else:
-        # Check if the subtopic column exists
-        c.execute("PRAGMA table_info(progress)")
-        columns = [info[1] for info in c.fetchall()]
-        if 'subtopic' not in columns:
-            # Add the subtopic column if it doesn't exist
-            c.execute("ALTER TABLE progress ADD COLUMN subtopic TEXT")
-            conn.commit()
 
     # Get topic performance data
     try:
@@ -1940,28 +1869,31 @@ def show_topic_analysis():
             ]
             c.executemany("INSERT INTO questions (date, question, answer, topic, difficulty, correct) VALUES (?, ?, ?, ?, ?, ?)", sample_questions)
             conn.commit()
-        else:
-            # Check if the correct column exists
-            c.execute("PRAGMA table_info(questions)")
-            columns = [info[1] for info in c.fetchall()]
-            if 'correct' not in columns:
-                # Add the correct column if it doesn't exist
-                c.execute("ALTER TABLE questions ADD COLUMN correct INTEGER DEFAULT 0")
-                conn.commit()
 
         try:
+            # Attempt counts and accuracy come from the per-day rollup, not a rescan of every attempt
             c.execute("""
-                SELECT difficulty, COUNT(*) as count, AVG(CASE WHEN correct = 1 THEN 100 ELSE 0 END) as success_rate
-                FROM questions
+                SELECT difficulty, SUM(attempts) as count, 100.0 * SUM(correct) / SUM(attempts) as success_rate
+                FROM question_accuracy_daily
                 WHERE topic = ?
                 GROUP BY difficulty
             """, (selected_topic,))
             question_data = c.fetchall()
+
+            c.execute("""
+                SELECT date, difficulty, 100.0 * SUM(correct) / SUM(attempts) as success_rate
+                FROM question_accuracy_daily
+                WHERE topic = ?
+                GROUP BY date, difficulty
+                ORDER BY date
+            """, (selected_topic,))
+            accuracy_trend = c.fetchall()
         except sqlite3.OperationalError as e:
             st.error(f"Database error: {e}")
             st.info("Creating sample data for demonstration.")
 
             # Create sample data for display
+            accuracy_trend = []
             if selected_topic == "VARC":
                 question_data = [("Easy", 5, 80.0), ("Medium", 8, 62.5), ("Hard", 3, 33.3)]
             elif selected_topic == "DILR":
@@ -1982,8 +1914,8 @@ def show_topic_analysis():
                     df_questions,
                     x='Difficulty',
                     y='Count',
-                    title=f'{selected_topic} Questions by Difficulty',
-                    labels={'Count': 'Number of Questions'}
+                    title=f'{selected_topic} Attempts by Difficulty',
+                    labels={'Count': 'Number of Attempts'}
                 )
                 st.plotly_chart(fig_count, use_container_width=True)
 
@@ -1997,6 +1929,21 @@ def show_topic_analysis():
                     labels={'Success Rate': 'Success Rate (%)'}
                 )
                 st.plotly_chart(fig_success, use_container_width=True)
+
+            # Accuracy over time, one line per difficulty
+            if accuracy_trend:
+                df_trend = pd.DataFrame(accuracy_trend, columns=['Date', 'Difficulty', 'Success Rate'])
+                fig_trend = px.line(
+                    df_trend,
+                    x='Date',
+                    y='Success Rate',
+                    color='Difficulty',
+                    markers=True,
+                    title=f'{selected_topic} Accuracy Over Time',
+                    labels={'Success Rate': 'Success Rate (%)'}
+                )
+                fig_trend.update_layout(yaxis_range=[0, 100])
+                st.plotly_chart(fig_trend, use_container_width=True)
         else:
             st.info(f"No question data available for {selected_topic}. Add some questions to see analysis.")
 
@@ -2027,27 +1974,9 @@ def show_topic_analysis():
                 (datetime.now().strftime('%Y-%m-%d'), 'Quant', 'Arithmetic', 55, 'Practiced arithmetic problems')
             ]
             c.executemany("INSERT INTO study_log (date, topic, subtopic, time_spent, notes) VALUES (?, ?, ?, ?, ?)", sample_data)
+            # Sample days arrive out of order, so recompute the streak in one pass
+            rebuild_study_streak(c)
             conn.commit()
-        else:
-            # Check if the subtopic column exists
-            c.execute("PRAGMA table_info(study_log)")
-            columns = [info[1] for info in c.fetchall()]
-            if 'subtopic' not in columns:
-                # Add the subtopic column if it doesn't exist
-                c.execute("ALTER TABLE study_log ADD COLUMN subtopic TEXT")
-                conn.commit()
-
-                # Update existing records with sample subtopics
-                c.execute("SELECT DISTINCT topic FROM study_log")
-                topics = c.fetchall()
-                for topic in topics:
-                    if topic[0] == 'VARC':
-                        c.execute("UPDATE study_log SET subtopic = 'Reading Comprehension' WHERE topic = ? AND subtopic IS NULL", (topic[0],))
-                    elif topic[0] == 'DILR':
-                        c.execute("UPDATE study_log SET subtopic = 'Data Interpretation' WHERE topic = ? AND subtopic IS NULL", (topic[0],))
-                    elif topic[0] == 'Quant':
-                        c.execute("UPDATE study_log SET subtopic = 'Algebra' WHERE topic = ? AND subtopic IS NULL", (topic[0],))
-                conn.commit()
 
         try:
             c.execute("""
@@ -2139,7 +2068,6 @@ def show_settings():
 
     # Initialize database connection
     conn = init_db()
-    c = conn.cursor()
 
     # Create tabs for different settings
     tab1, tab2, tab3 = st.tabs(["General Settings", "Data Management", "Integrations"])
@@ -2148,32 +2076,13 @@ def show_settings():
         st.header("General Settings")
 
         # Get current settings
-        c.execute("SELECT * FROM productivity_settings WHERE user_id = 'default'")
-        settings = c.fetchone()
-
-        if settings:
-            focus_duration = settings[1]  # focus_duration
-            break_duration = settings[2]  # break_duration
-            reminder_frequency = settings[3]  # reminder_frequency
-            notification_enabled = settings[4]  # notification_enabled
-            daily_goal = settings[5]  # daily_goal
-            reminder_time = settings[6]  # reminder_time
-        else:
-            # Default settings
-            focus_duration = 25
-            break_duration = 5
-            reminder_frequency = "daily"
-            notification_enabled = False
-            daily_goal = 120
-            reminder_time = "09:00"
-
-            # Insert default settings
-            c.execute("""
-                INSERT INTO productivity_settings
-                (user_id, focus_duration, break_duration, reminder_frequency, notification_enabled, daily_goal, reminder_time)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, ("default", focus_duration, break_duration, reminder_frequency, notification_enabled, daily_goal, reminder_time))
-            conn.commit()
+        settings = load_settings()
+        focus_duration = settings.focus_duration
+        break_duration = settings.break_duration
+        reminder_frequency = settings.reminder_frequency
+        notification_enabled = settings.notification_enabled
+        daily_goal = settings.daily_goal
+        reminder_time = settings.reminder_time
 
         # Form for updating general settings
         with st.form("general_settings"):
@@ -2222,14 +2131,10 @@ def show_settings():
             if submitted:
                 try:
                     # Update settings in database
-                    c.execute("""
-                        UPDATE productivity_settings
-                        SET focus_duration = ?, break_duration = ?, reminder_frequency = ?,
-                            notification_enabled = ?, daily_goal = ?, reminder_time = ?
-                        WHERE user_id = ?
-                    """, (new_focus, new_break, new_reminder_frequency, new_reminder_enabled,
-                          new_daily_goal, new_reminder_time.strftime("%H:%M"), "default"))
-                    conn.commit()
+                    save_timer_settings(focus_duration=new_focus, break_duration=new_break,
+                                        reminder_frequency=new_reminder_frequency,
+                                        notification_enabled=new_reminder_enabled, daily_goal=new_daily_goal,
+                                        reminder_time=new_reminder_time.strftime("%H:%M"))
                     st.success("Settings updated successfully!")
 
                     # Also save CAT goals in session state for use elsewhere
@@ -2262,10 +2167,23 @@ def show_settings():
 
         # Import data
         st.subheader("Import Data")
-        uploaded_file = st.file_uploader("Upload Data File", type=["zip"])
-        if uploaded_file is not None:
-            st.info("This feature will import data from a previously exported ZIP file.")
-            st.info("Feature coming soon!")
+        st.caption("Upload a ZIP of CSV files, or a single CSV, named " + ", ".join(IMPORTERS) +
+                   ". Each CSV needs a header row with the table's column names.")
+        uploaded_file = st.file_uploader("Upload Data File", type=["zip", "csv"])
+        if uploaded_file is not None and st.button("Import Data"):
+            progress_log = st.empty()
+            chunk_lines = []
+
+            def show_chunk(chunk):
+                chunk_lines.append(f"Chunk {chunk.index}: {chunk.rows} rows ({chunk.rows_per_second:,.0f} rows/s)")
+                progress_log.text("\n".join(chunk_lines[-5:]))
+
+            try:
+                results = import_file(uploaded_file.name, uploaded_file.getvalue(), on_chunk=show_chunk)
+                for csv_name, reports in results.items():
+                    st.success(f"Imported {sum(r.rows for r in reports)} rows from {csv_name}")
+            except ValueError as e:
+                st.error(f"Nothing was imported: {e}")
 
         # Reset data
         st.subheader("Reset Data")
@@ -2360,13 +2278,14 @@ def show_lecture_tracker():
 
                 # Save as a note with lecture tag
                 tags = f"{topic}, lecture, {subtopic}" if subtopic else f"{topic}, lecture"
-                save_lecture_notes(title, full_notes, date)
+                save_lecture_notes(title, full_notes, date, tags)
                 st.success(f"Lecture '{title}' saved successfully!")
 
     with tab2:
         st.header("View Lectures")
 
-        # Filter options
+        # Search and filter options
+        search_term = st.text_input("Search lectures", "", help="Matches whole words and word prefixes, best matches first")
         col1, col2 = st.columns(2)
         with col1:
             topic_filter = st.selectbox(
@@ -2376,24 +2295,16 @@ def show_lecture_tracker():
         with col2:
             sort_order = st.selectbox(
                 "Sort By",
-                ["Date (Newest First)", "Date (Oldest First)", "Title (A-Z)"]
+                list(LECTURE_SORT_ORDERS),
+                disabled=bool(search_term),
+                help="Search results are sorted by relevance"
             )
 
-        # Build query based on filters
-        query = "SELECT date, title, content, tags FROM notes WHERE tags LIKE '%lecture%'"
-
-        if topic_filter != "All":
-            query += f" AND tags LIKE '%{topic_filter}%'"
-
-        if sort_order == "Date (Newest First)":
-            query += " ORDER BY date DESC"
-        elif sort_order == "Date (Oldest First)":
-            query += " ORDER BY date ASC"
-        else:  # Title (A-Z)
-            query += " ORDER BY title ASC"
+        # Build a parameterized query based on search and filters
+        query = lectures_query(search_term, topic_filter, sort_order)
 
         try:
-            c.execute(query)
+            c.execute(*query.build())
             lectures = c.fetchall()
         except sqlite3.OperationalError as e:
             st.error(f"Database error: {e}")
@@ -2401,7 +2312,10 @@ def show_lecture_tracker():
 
         if lectures:
             # Display lectures
-            for i, (date, title, content, tags) in enumerate(lectures):
+            for i, (date, title, content, tags, snippet) in enumerate(lectures):
+                # Show where the search matched, highlighted
+                if snippet:
+                    st.caption(snippet)
                 with st.expander(f"{title} - {date}", expanded=False):
                     # Display lecture content
                     st.markdown(content)
@@ -2428,7 +2342,7 @@ def show_lecture_tracker():
 
         # Count lectures by topic
         topic_counts = {}
-        for _, _, _, tags in lectures:
+        for _, _, _, tags, _ in lectures:
             for topic in ["VARC", "DILR", "Quant", "General"]:
                 if topic.lower() in tags.lower():
                     topic_counts[topic] = topic_counts.get(topic, 0) + 1
@@ -2470,7 +2384,7 @@ def show_study_patterns():
     c = conn.cursor()
 
     # Get date range for filtering
-    c.execute("SELECT MIN(date), MAX(date) FROM study_log")
+    c.execute("SELECT MIN(date), MAX(date) FROM daily_study_rollup")
     date_range = c.fetchone()
 
     if date_range and date_range[0] and date_range[1]:
@@ -2533,12 +2447,14 @@ def show_study_patterns():
             sample_data.append((date, topic, subtopic, time_spent, f"Study session on {subtopic}"))
 
         c.executemany("INSERT INTO study_log (date, topic, subtopic, time_spent, notes) VALUES (?, ?, ?, ?, ?)", sample_data)
+        # Sample days arrive out of order, so recompute the streak in one pass
+        rebuild_study_streak(c)
         conn.commit()
 
-    # Get study log data within selected date range
+    # Get daily study totals within selected date range
     c.execute("""
-        SELECT date, topic, subtopic, time_spent
-        FROM study_log
+        SELECT date, topic, subtopic, total_minutes
+        FROM daily_study_rollup
         WHERE date BETWEEN ? AND ?
         ORDER BY date
     """, (start_date_str, end_date_str))
@@ -2636,24 +2552,8 @@ def show_study_patterns():
         study_days = df_daily[df_daily['Hours'] > 0].shape[0]
         consistency = (study_days / total_days) * 100 if total_days > 0 else 0
 
-        # Calculate streak information
-        df_daily['HasStudied'] = df_daily['Hours'] > 0
-        df_daily['StreakGroup'] = (df_daily['HasStudied'] != df_daily['HasStudied'].shift()).cumsum()
-        streak_groups = df_daily.groupby(['StreakGroup', 'HasStudied']).size().reset_index(name='Count')
-
-        # Find the longest streak of study days
-        if not streak_groups.empty and True in streak_groups['HasStudied'].values:
-            longest_streak = streak_groups[streak_groups['HasStudied'] == True]['Count'].max()
-        else:
-            longest_streak = 0
-
-        # Find current streak
-        current_streak = 0
-        for i in range(len(df_daily) - 1, -1, -1):
-            if df_daily.iloc[i]['HasStudied']:
-                current_streak += 1
-            else:
-                break
+        # Streaks come from the persisted state rather than the selected range
+        current_streak, longest_streak, _ = get_study_streak()
 
         # Display consistency metrics
         col1, col2, col3 = st.columns(3)
@@ -2728,6 +2628,12 @@ def show_study_patterns():
     # Close database connection
     conn.close()
 
+def lecture_progress_frame(snapshot):
+    """Per-category lecture totals from a dashboard snapshot, with a Completion % column"""
+    df = pd.DataFrame(list(snapshot.lecture_progress), columns=["Category", "Total", "Watched"])
+    df["Completion"] = (df["Watched"] / df["Total"] * 100).round(1)
+    return df
+
 def show_video_resources():
     # Add a more visually appealing header
     col1, col2 = st.columns([1, 5])
@@ -2747,26 +2653,9 @@ def show_video_resources():
     # Create tabs for different lecture categories
     tab1, tab2, tab3, tab4 = st.tabs(["Spreadsheet View", "VARC", "DILR", "Quant"])
 
-    # Check if videos table exists
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='videos'")
-    if c.fetchone() is None:
-        # Create lectures table
-        c.execute('''CREATE TABLE IF NOT EXISTS videos
-                     (date TEXT, title TEXT, url TEXT, category TEXT, notes TEXT, rating INTEGER, watched BOOLEAN DEFAULT 0)''')
-        conn.commit()
-    else:
-        # Check if watched column exists
-        c.execute("PRAGMA table_info(videos)")
-        columns = [info[1] for info in c.fetchall()]
-        if 'watched' not in columns:
-            # Add watched column if it doesn't exist
-            try:
-                c.execute("ALTER TABLE videos ADD COLUMN watched BOOLEAN DEFAULT 0")
-                conn.commit()
-                st.success("Updated database schema to include watched status.")
-            except sqlite3.OperationalError as e:
-                st.error(f"Error updating database schema: {e}")
-
+    # Seed an empty videos table with sample lectures
+    c.execute("SELECT COUNT(*) FROM videos")
+    if c.fetchone()[0] == 0:
         # Add sample lectures from Rodha YouTube channel
         sample_videos = [
             # Quants - Arithmetic
@@ -2785,6 +2674,17 @@ def show_video_resources():
         c.executemany("INSERT INTO videos (date, title, url, category, notes, rating, watched) VALUES (?, ?, ?, ?, ?, ?, ?)", sample_videos)
         conn.commit()
 
+    # Sync the catalog into videos only when it changed
+    try:
+        catalog = load_catalog()
+    except (OSError, ValueError) as e:
+        st.error(f"Could not load the lecture catalog: {e}")
+        catalog = empty_catalog()
+    sync_catalog(catalog)
+
+    # Per-category totals shared with the dashboard's lecture card
+    lecture_progress = lecture_progress_frame(get_dashboard_snapshot())
+
     # Function to display lectures for a category
     def show_category_videos(category):
         try:
@@ -2863,98 +2763,8 @@ def show_video_resources():
         sheet_url = "https://docs.google.com/spreadsheets/d/121TJowkkWLeaPSAYp5Cokg0If9iwBtFDF6CZ5JWIYO0/edit?pli=1&gid=0#gid=0"
         st.markdown(f"[Open Google Spreadsheet]({sheet_url})")
 
-        # Create a dataframe with all the lecture data from the spreadsheet
-        spreadsheet_data = [
-            # Quants - Arithmetic
-            ["Quant", "Arithmetic", "Speed Math", "SM 1", "https://www.youtube.com/watch?v=7Ojn_hVm9Xw"],
-            ["Quant", "Arithmetic", "Speed Math", "SM 2", "https://www.youtube.com/watch?v=7Ojn_hVm9Xw"],
-            ["Quant", "Arithmetic", "Speed Math", "SM 3", "https://www.youtube.com/watch?v=7Ojn_hVm9Xw"],
-            ["Quant", "Arithmetic", "Speed Math", "SM 4", "https://www.youtube.com/watch?v=7Ojn_hVm9Xw"],
-            ["Quant", "Arithmetic", "Speed Math", "SM 5", "https://www.youtube.com/watch?v=7Ojn_hVm9Xw"],
-            ["Quant", "Arithmetic", "Speed Math", "SM 6", "https://www.youtube.com/watch?v=7Ojn_hVm9Xw"],
-            ["Quant", "Arithmetic", "Averages", "AVG 1", "https://www.youtube.com/watch?v=Suw0WDHMba0"],
-            ["Quant", "Arithmetic", "Averages", "AVG 2", "https://www.youtube.com/watch?v=Suw0WDHMba0"],
-            ["Quant", "Arithmetic", "Averages", "AVG 3", "https://www.youtube.com/watch?v=Suw0WDHMba0"],
-            ["Quant", "Arithmetic", "Averages", "AVG 4", "https://www.youtube.com/watch?v=Suw0WDHMba0"],
-            ["Quant", "Arithmetic", "Alligation & Mixtures", "AM 1", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["Quant", "Arithmetic", "Alligation & Mixtures", "AM 2", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["Quant", "Arithmetic", "Alligation & Mixtures", "AM 3", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["Quant", "Arithmetic", "Alligation & Mixtures", "AM 4", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["Quant", "Arithmetic", "Alligation & Mixtures", "AM 5", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["Quant", "Arithmetic", "Alligation & Mixtures", "AM 6", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-
-            # DILR
-            ["DILR", "Arrangement", "Linear & Circular Arrangement", "LCA 1", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["DILR", "Arrangement", "Linear & Circular Arrangement", "LCA 2", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["DILR", "Arrangement", "Linear & Circular Arrangement", "LCA 3", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["DILR", "Arrangement", "Linear & Circular Arrangement", "LCA 4", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["DILR", "Arrangement", "Linear & Circular Arrangement", "LCA 5", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["DILR", "Sets", "Venn Diagrams", "VD 1", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["DILR", "Sets", "Venn Diagrams", "VD 2", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["DILR", "Sets", "Venn Diagrams", "VD 3", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["DILR", "Sets", "Venn Diagrams", "VD 4", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["DILR", "Sets", "Venn Diagrams", "VD 5", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["DILR", "Sets", "Venn Diagrams", "VD 6", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-
-            # VARC
-            ["VARC", "Reading", "Reading Comprehension", "RC 1", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["VARC", "Reading", "Reading Comprehension", "RC 2", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["VARC", "Reading", "Reading Comprehension", "RC 3", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["VARC", "Reading", "Reading Comprehension", "RC 4", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["VARC", "Reading", "Reading Comprehension", "RC 5", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["VARC", "Reading", "Reading Comprehension", "RC 6", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["VARC", "Reading", "Reading Comprehension", "RC 7", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["VARC", "Reading", "Reading Comprehension", "RC 8", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["VARC", "Reading", "Reading Comprehension", "RC 9", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["VARC", "Verbal", "Para Jumbles", "PJ 1", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"],
-            ["VARC", "Verbal", "Para Jumbles", "PJ 2", "https://www.youtube.com/watch?v=Rl5LpyvMh-c"]
-        ]
-
-        # Create a DataFrame
-        df = pd.DataFrame(spreadsheet_data, columns=["Section", "Topic", "Subtopic", "Code", "URL"])
-
-        # Add a full title column
-        df["Title"] = df["Subtopic"] + " (" + df["Code"] + ")"
-
-        # Get watched status for each lecture
-        for i, row in df.iterrows():
-            title = row["Title"]
-            try:
-                c.execute("SELECT watched FROM videos WHERE title = ?", (title,))
-                result = c.fetchone()
-                if result:
-                    df.at[i, "Watched"] = "✅" if result[0] else "⬜"
-                else:
-                    # If not in database, add it
-                    try:
-                        c.execute("""
-                            INSERT INTO videos (date, title, url, category, notes, rating, watched)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """, (datetime.now().strftime('%Y-%m-%d'), title, row["URL"], row["Section"], "", 5, 0))
-                        conn.commit()
-                        df.at[i, "Watched"] = "⬜"
-                    except sqlite3.OperationalError:
-                        # If watched column doesn't exist yet
-                        c.execute("""
-                            INSERT INTO videos (date, title, url, category, notes, rating)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        """, (datetime.now().strftime('%Y-%m-%d'), title, row["URL"], row["Section"], "", 5))
-                        conn.commit()
-                        df.at[i, "Watched"] = "⬜"
-            except sqlite3.OperationalError:
-                # If watched column doesn't exist yet
-                c.execute("SELECT rowid FROM videos WHERE title = ?", (title,))
-                result = c.fetchone()
-                if result:
-                    df.at[i, "Watched"] = "⬜"  # Default to unwatched
-                else:
-                    # Add without watched column
-                    c.execute("""
-                        INSERT INTO videos (date, title, url, category, notes, rating)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    """, (datetime.now().strftime('%Y-%m-%d'), title, row["URL"], row["Section"], "", 5))
-                    conn.commit()
-                    df.at[i, "Watched"] = "⬜"
+        # Read watched status for the catalog in one query
+        df = with_watched_status(c, catalog)
 
         # Create filters
         col1, col2, col3 = st.columns(3)
@@ -2990,8 +2800,8 @@ def show_video_resources():
 
         # Display statistics
         st.subheader("Progress Statistics")
-        total_lectures = len(df)
-        watched_lectures = len(df[df["Watched"] == "✅"])
+        total_lectures = int(lecture_progress["Total"].sum())
+        watched_lectures = int(lecture_progress["Watched"].sum())
         progress_percentage = round((watched_lectures / total_lectures) * 100, 1) if total_lectures > 0 else 0
 
         col1, col2, col3 = st.columns(3)
@@ -3007,26 +2817,14 @@ def show_video_resources():
 
         # Section-wise progress
         st.subheader("Section-wise Progress")
-        section_progress = {}
-        for section in df["Section"].unique():
-            section_df = df[df["Section"] == section]
-            section_total = len(section_df)
-            section_watched = len(section_df[section_df["Watched"] == "✅"])
-            section_progress[section] = round((section_watched / section_total) * 100, 1) if section_total > 0 else 0
-
-        # Create a DataFrame for the chart
-        progress_df = pd.DataFrame({
-            "Section": list(section_progress.keys()),
-            "Progress": list(section_progress.values())
-        })
 
         # Create a bar chart
         fig = px.bar(
-            progress_df,
+            lecture_progress.rename(columns={"Category": "Section"}),
             x="Section",
-            y="Progress",
+            y="Completion",
             title="Progress by Section",
-            labels={"Progress": "Completion %"},
+            labels={"Completion": "Completion %"},
             color="Section",
             color_discrete_map={
                 "VARC": "#1f77b4",
@@ -3041,18 +2839,16 @@ def show_video_resources():
         col1, col2 = st.columns(2)
         with col1:
             if st.button("Mark All Filtered as Watched"):
-                for _, row in filtered_df.iterrows():
-                    c.execute("UPDATE videos SET watched = 1 WHERE title = ?", (row["Title"],))
-                conn.commit()
-                st.success(f"Marked {len(filtered_df)} lectures as watched")
+                changed = set_lectures_watched(filtered_df["Title"].tolist(), True)
+                st.session_state.lecture_bulk_message = f"Marked {changed} lectures as watched"
                 st.rerun()
         with col2:
             if st.button("Mark All Filtered as Unwatched"):
-                for _, row in filtered_df.iterrows():
-                    c.execute("UPDATE videos SET watched = 0 WHERE title = ?", (row["Title"],))
-                conn.commit()
-                st.success(f"Marked {len(filtered_df)} lectures as unwatched")
+                changed = set_lectures_watched(filtered_df["Title"].tolist(), False)
+                st.session_state.lecture_bulk_message = f"Marked {changed} lectures as unwatched"
                 st.rerun()
+        if "lecture_bulk_message" in st.session_state:
+            st.success(st.session_state.pop("lecture_bulk_message"))
 
     # Display videos by category
     with tab2:
@@ -3066,19 +2862,14 @@ def show_video_resources():
 
     # Lecture completion statistics
     st.subheader("Lecture Completion Summary")
+    total_lectures = int(lecture_progress["Total"].sum())
+    watched_lectures = int(lecture_progress["Watched"].sum())
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        c.execute("SELECT COUNT(*) FROM videos")
-        total_lectures = c.fetchone()[0] or 0
         st.metric("Total Lectures", total_lectures)
 
     with col2:
-        try:
-            c.execute("SELECT COUNT(*) FROM videos WHERE watched = 1")
-            watched_lectures = c.fetchone()[0] or 0
-        except sqlite3.OperationalError:
-            watched_lectures = 0
         st.metric("Completed Lectures", watched_lectures)
 
     with col3:
@@ -3086,30 +2877,10 @@ def show_video_resources():
         st.metric("Completion Rate", f"{completion_rate}%")
 
     # Category breakdown
-    try:
-        c.execute("""
-            SELECT category, COUNT(*) as total, SUM(watched) as watched
-            FROM videos
-            GROUP BY category
-        """)
-        category_data = c.fetchall()
-    except sqlite3.OperationalError:
-        # If watched column doesn't exist
-        c.execute("""
-            SELECT category, COUNT(*) as total
-            FROM videos
-            GROUP BY category
-        """)
-        # Add a default watched value of 0
-        category_data = [(category, total, 0) for category, total in c.fetchall()]
-
-    if category_data:
-        df_categories = pd.DataFrame(category_data, columns=["Category", "Total", "Watched"])
-        df_categories["Completion"] = (df_categories["Watched"] / df_categories["Total"] * 100).round(1)
-
+    if not lecture_progress.empty:
         # Create a bar chart for category completion
         fig = px.bar(
-            df_categories,
+            lecture_progress,
             x="Category",
             y="Completion",
             title="Completion Rate by Category",
@@ -3183,13 +2954,13 @@ if __name__ == "__main__":
     c = conn.cursor()
 
     # Get total study hours
-    c.execute("SELECT SUM(time_spent) FROM study_log")
+    c.execute("SELECT SUM(total_minutes) FROM daily_study_rollup")
     total_minutes = c.fetchone()[0] or 0
     total_hours = round(total_minutes / 60, 1)
 
     # Get today's study time
     today = datetime.now().strftime('%Y-%m-%d')
-    c.execute("SELECT SUM(time_spent) FROM study_log WHERE date = ?", (today,))
+    c.execute("SELECT SUM(total_minutes) FROM daily_study_rollup WHERE date = ?", (today,))
     today_minutes = c.fetchone()[0] or 0
 
     # Get flashcard count
@@ -14,6 +14,17 @@ APP_GITHUB = "https://github.com/yourusername/CAT-Preparation-Tracker"
 
 # Database settings
 DB_NAME = "cat_prep.db"
+LECTURE_CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lecture_catalog.csv")
+DB_POOL_SIZE = 4             # idle connections kept open for reuse
+DB_CACHE_SIZE_KB = 16384     # page cache per connection
+DB_BUSY_TIMEOUT_MS = 5000    # wait this long on a locked database before failing
+BULK_CHUNK_SIZE = 500        # rows per transaction for bulk imports
+PAGE_SIZES = [10, 25, 50, 100]  # rows per page offered by paginated lists
+FLASHCARD_MASTERED_DAYS = 21 # review interval at which a card counts as mastered
+DASHBOARD_CACHE_TTL = 30     # seconds a dashboard snapshot is reused when nothing was written
+PRACTICE_SET_SIZE = 10       # questions in an adaptive practice set
+PRACTICE_RECENT_DAYS = 30    # window of scores and attempts that drives practice weighting
+MOCK_TEST_FLUSH_SIZE = 10    # mock test answers buffered before they are written
 
 # Default user settings
 DEFAULT_FOCUS_DURATION = 25  # minutes
@@ -24,6 +35,15 @@ DEFAULT_REMINDER_TIME = "09:00"
 # CAT exam sections
 CAT_SECTIONS = ["VARC", "DILR", "Quant"]
 
+# Question difficulty levels
+DIFFICULTY_LEVELS = ["Easy", "Medium", "Hard"]
+
+# Expected seconds per question, used to fit a practice set into a time budget
+PRACTICE_SECONDS_PER_QUESTION = {"Easy": 60, "Medium": 120, "Hard": 180}
+
+# Mock test paper: section -> (questions, minutes), in the order sections are sat
+MOCK_TEST_SECTIONS = {"VARC": (24, 40), "DILR": (20, 40), "Quant": (22, 40)}
+
 # Topic subtopics
 TOPIC_SUBTOPICS = {
     "VARC": ["Reading Comprehension", "Vocabulary", "Grammar", "Critical Reasoning", "Para Jumbles", "Para Summary"],
@@ -0,0 +1,19 @@
+import pytest
+
+import db
+from migrations import migrate
+
+
+@pytest.fixture
+def empty_db(tmp_path, monkeypatch):
+    """Point the connection pool at an empty database, not yet migrated, for one test"""
+    db.close_all()
+    monkeypatch.setattr(db, "DB_NAME", str(tmp_path / "cat_prep.db"))
+    yield
+    db.close_all()
+
+
+@pytest.fixture
+def fresh_db(empty_db):
+    """Point the connection pool at an empty, fully migrated database for one test"""
+    migrate()
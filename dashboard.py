@@ -0,0 +1,163 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from config import DASHBOARD_CACHE_TTL
+from db import connect, write_generation
+from rollups import streak_as_of
+
+# Every headline counter on the dashboard in a single round trip
+_COUNTERS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM flashcards WHERE mastered = 1),
+        (SELECT COUNT(*) FROM flashcards),
+        (SELECT COALESCE(SUM(correct), 0) FROM question_accuracy_daily),
+        (SELECT COALESCE(SUM(attempts), 0) FROM question_accuracy_daily),
+        (SELECT COALESCE(SUM(total_minutes), 0) FROM daily_study_rollup),
+        (SELECT COALESCE(SUM(total_minutes), 0) FROM daily_study_rollup WHERE date = :today),
+        (SELECT COALESCE(SUM(total_minutes), 0) FROM daily_study_rollup WHERE date = :yesterday),
+        (SELECT COUNT(DISTINCT date) FROM daily_study_rollup),
+        (SELECT current_streak FROM study_streak WHERE id = 1),
+        (SELECT longest_streak FROM study_streak WHERE id = 1),
+        (SELECT last_study_date FROM study_streak WHERE id = 1)
+"""
+
+# Per-section averages feed the strongest/weakest cards and the progress chart
+_SECTION_SCORES_SQL = """
+    SELECT section, AVG(score) as avg_score
+    FROM progress
+    GROUP BY section
+"""
+
+
+# Lecture totals per category feed the lecture card and the Video Resources progress views
+_LECTURE_PROGRESS_SQL = """
+    SELECT COALESCE(category, ''), COUNT(*), COALESCE(SUM(watched), 0)
+    FROM videos
+    GROUP BY category
+    ORDER BY category
+"""
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Headline dashboard metrics as of one point in time"""
+    mastered_flashcards: int = 0
+    total_flashcards: int = 0
+    correct_attempts: int = 0
+    total_attempts: int = 0
+    total_minutes: int = 0
+    today_minutes: int = 0
+    yesterday_minutes: int = 0
+    study_days: int = 0
+    streak: int = 0  # length of the run ending on last_study_date
+    longest_streak: int = 0
+    last_study_date: str = None
+    section_scores: tuple = field(default_factory=tuple)  # (section, avg_score) pairs
+    lecture_progress: tuple = field(default_factory=tuple)  # (category, total, watched) triples
+
+    @property
+    def total_lectures(self):
+        return sum(total for _, total, _ in self.lecture_progress)
+
+    @property
+    def watched_lectures(self):
+        return sum(watched for _, _, watched in self.lecture_progress)
+
+    @staticmethod
+    def _percentage(part, whole):
+        return round((part / whole) * 100) if whole > 0 else 0
+
+    @property
+    def lecture_percentage(self):
+        return self._percentage(self.watched_lectures, self.total_lectures)
+
+    @property
+    def mastery_percentage(self):
+        return self._percentage(self.mastered_flashcards, self.total_flashcards)
+
+    @property
+    def question_percentage(self):
+        return self._percentage(self.correct_attempts, self.total_attempts)
+
+    @property
+    def study_hours(self):
+        return round(self.total_minutes / 60, 1)
+
+    @property
+    def today_delta(self):
+        return self.today_minutes - self.yesterday_minutes
+
+    @property
+    def current_streak(self):
+        return streak_as_of(self.streak, self.last_study_date)
+
+    @property
+    def best_section(self):
+        """(section, average score) with the highest average, or None without scores"""
+        return max(self.section_scores, key=lambda s: s[1]) if self.section_scores else None
+
+    @property
+    def weakest_section(self):
+        """(section, average score) with the lowest average, or None without scores"""
+        return min(self.section_scores, key=lambda s: s[1]) if self.section_scores else None
+
+
+# (cache key, snapshot, time it was taken)
+_cached = None
+_cache_lock = threading.Lock()
+
+
+def load_dashboard_snapshot(conn, today=None):
+    """Compute a fresh DashboardSnapshot with three queries on the given connection"""
+    today = today or datetime.now().date()
+    c = conn.cursor()
+    c.execute(_COUNTERS_SQL, {
+        "today": today.strftime('%Y-%m-%d'),
+        "yesterday": (today - timedelta(days=1)).strftime('%Y-%m-%d'),
+    })
+    counters = c.fetchone()
+    c.execute(_SECTION_SCORES_SQL)
+    section_scores = tuple((section, avg_score) for section, avg_score in c.fetchall() if avg_score is not None)
+    c.execute(_LECTURE_PROGRESS_SQL)
+    lecture_progress = tuple(c.fetchall())
+    # Missing streak row reads as NULL; only last_study_date may stay None
+    counters = tuple(0 if value is None else value for value in counters[:-1]) + counters[-1:]
+    return DashboardSnapshot(*counters, section_scores=section_scores, lecture_progress=lecture_progress)
+
+
+def get_dashboard_snapshot():
+    """
+    Return the dashboard metrics, reusing the last snapshot when possible.
+
+    A cached snapshot is reused for up to DASHBOARD_CACHE_TTL seconds as long as
+    nothing has been committed through the connection pool and the date has not
+    changed since it was taken.
+    """
+    global _cached
+    today = datetime.now().date()
+    key = (write_generation(), today)
+
+    with _cache_lock:
+        if _cached is not None:
+            cached_key, snapshot, taken_at = _cached
+            if cached_key == key and time.monotonic() - taken_at < DASHBOARD_CACHE_TTL:
+                return snapshot
+
+    conn = connect()
+    try:
+        snapshot = load_dashboard_snapshot(conn, today)
+    finally:
+        conn.close()
+
+    with _cache_lock:
+        _cached = (key, snapshot, time.monotonic())
+    return snapshot
+
+
+def invalidate_dashboard_snapshot():
+    """Drop the cached snapshot, e.g. after the database was reset or replaced"""
+    global _cached
+    with _cache_lock:
+        _cached = None
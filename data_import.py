@@ -0,0 +1,76 @@
+import argparse
+import csv
+import io
+import os
+import zipfile
+
+from utils import (
+    save_questions_bulk,
+    save_flashcards_bulk,
+    save_study_sessions_bulk,
+    save_progress_bulk
+)
+
+# CSV file name (inside the ZIP, or uploaded on its own) -> bulk writer.
+# Each CSV needs a header row naming the table's columns.
+IMPORTERS = {
+    "questions.csv": save_questions_bulk,
+    "flashcards.csv": save_flashcards_bulk,
+    "study_log.csv": save_study_sessions_bulk,
+    "progress.csv": save_progress_bulk,
+}
+
+
+def _read_csv(csv_name, raw):
+    try:
+        return list(csv.DictReader(io.StringIO(raw.decode("utf-8-sig"))))
+    except UnicodeDecodeError:
+        raise ValueError(f"{csv_name} is not UTF-8 text") from None
+
+
+def import_file(name, data, on_chunk=None):
+    """
+    Import a ZIP of CSVs or a single CSV named after one of IMPORTERS.
+
+    Returns {csv name: list of ChunkReports}. Every CSV is validated before any
+    of them is written, so a bad file imports nothing.
+    """
+    name = os.path.basename(name).lower()
+    if name.endswith(".zip"):
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                members = {os.path.basename(m).lower(): m for m in archive.namelist()}
+                files = {csv_name: archive.read(members[csv_name]) for csv_name in IMPORTERS if csv_name in members}
+        except zipfile.BadZipFile:
+            raise ValueError(f"{name} is not a valid ZIP file") from None
+    elif name in IMPORTERS:
+        files = {name: data}
+    else:
+        raise ValueError(f"Expected a .zip or one of {', '.join(IMPORTERS)}, got {name!r}")
+
+    if not files:
+        raise ValueError(f"No importable files found; expected any of {', '.join(IMPORTERS)}")
+
+    tables = {csv_name: _read_csv(csv_name, raw) for csv_name, raw in files.items()}
+    # Validate every file before writing any of them
+    for csv_name, rows in tables.items():
+        try:
+            IMPORTERS[csv_name](rows, dry_run=True)
+        except ValueError as e:
+            raise ValueError(f"{csv_name}: {e}") from None
+
+    return {csv_name: IMPORTERS[csv_name](rows, on_chunk=on_chunk) for csv_name, rows in tables.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import CAT Prep Tracker data from CSV files")
+    parser.add_argument("path", help="a .zip of CSVs or one of: " + ", ".join(IMPORTERS))
+    args = parser.parse_args()
+
+    def report(chunk):
+        print(f"  chunk {chunk.index}: {chunk.rows} rows in {chunk.seconds:.3f}s ({chunk.rows_per_second:,.0f} rows/s)")
+
+    with open(args.path, "rb") as f:
+        results = import_file(args.path, f.read(), on_chunk=report)
+    for csv_name, reports in results.items():
+        print(f"{csv_name}: imported {sum(r.rows for r in reports)} rows")
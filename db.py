@@ -0,0 +1,147 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from config import DB_NAME, DB_POOL_SIZE, DB_CACHE_SIZE_KB, DB_BUSY_TIMEOUT_MS
+
+# Idle connections waiting to be reused, shared by every thread
+_pool = []
+_pool_lock = threading.Lock()
+
+# Per-thread state so nested transaction() blocks join the outer one
+_local = threading.local()
+
+# Bumped whenever a pooled connection commits changes; read-side caches key on it
+_write_generation = 0
+
+
+class PooledConnection(sqlite3.Connection):
+    """SQLite connection whose close() hands it back to the pool"""
+
+    def close(self):
+        release(self)
+
+    def commit(self):
+        sqlite3.Connection.commit(self)
+        # total_changes is cumulative per connection, so compare with the last commit
+        changes = self.total_changes
+        if changes != getattr(self, "_committed_changes", 0):
+            self._committed_changes = changes
+            _bump_write_generation()
+
+    def _close(self):
+        sqlite3.Connection.close(self)
+
+
+def _bump_write_generation():
+    global _write_generation
+    with _pool_lock:
+        _write_generation += 1
+
+
+def write_generation():
+    """Counter that changes after every committed write made through the pool"""
+    return _write_generation
+
+
+def _configure(conn):
+    """Apply the connection-level PRAGMAs once, when the connection is opened"""
+    c = conn.cursor()
+    c.execute("PRAGMA journal_mode=WAL")
+    c.execute("PRAGMA synchronous=NORMAL")
+    c.execute(f"PRAGMA cache_size=-{int(DB_CACHE_SIZE_KB)}")
+    c.execute(f"PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT_MS)}")
+    c.execute("PRAGMA temp_store=MEMORY")
+    c.close()
+
+
+def _open():
+    conn = sqlite3.connect(
+        DB_NAME,
+        timeout=DB_BUSY_TIMEOUT_MS / 1000,
+        check_same_thread=False,
+        factory=PooledConnection
+    )
+    _configure(conn)
+    return conn
+
+
+def connect():
+    """
+    Check out a long-lived connection from the pool.
+
+    The connection belongs to the calling thread until close() is called on it,
+    which returns it to the pool instead of closing the underlying handle.
+    """
+    with _pool_lock:
+        if _pool:
+            conn = _pool.pop()
+            conn._idle = False
+            return conn
+    return _open()
+
+
+def release(conn):
+    """Return a connection to the pool, discarding any uncommitted work; releasing it twice is a no-op"""
+    if getattr(conn, "_idle", False):
+        return
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+    except sqlite3.ProgrammingError:
+        return  # Already closed for real
+
+    with _pool_lock:
+        # Checked again under the lock in case two threads released it at once
+        if getattr(conn, "_idle", False):
+            return
+        if len(_pool) < DB_POOL_SIZE:
+            conn._idle = True
+            _pool.append(conn)
+            return
+    conn._close()
+
+
+@contextmanager
+def get_connection():
+    """Borrow a pooled connection for the duration of a with-block"""
+    conn = connect()
+    try:
+        yield conn
+    finally:
+        release(conn)
+
+
+@contextmanager
+def transaction():
+    """
+    Run a with-block inside a single transaction on a pooled connection.
+
+    Commits on success and rolls back on error. Nested transaction() blocks on
+    the same thread reuse the outer connection and commit with it.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
+        yield conn
+        return
+
+    conn = connect()
+    _local.conn = conn
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        _local.conn = None
+        release(conn)
+
+
+def close_all():
+    """Close every idle pooled connection (used before dropping or deleting the database)"""
+    with _pool_lock:
+        idle = list(_pool)
+        _pool.clear()
+    for conn in idle:
+        conn._close()
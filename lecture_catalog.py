@@ -0,0 +1,146 @@
+import hashlib
+import io
+import json
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from config import LECTURE_CATALOG_FILE, TOPIC_SUBTOPICS
+from db import transaction
+
+CATALOG_COLUMNS = ["Section", "Topic", "Subtopic", "Code", "URL"]
+
+# (file key, parsed frame) for the last catalog read
+_cached = None
+_cache_lock = threading.Lock()
+
+# Every catalog lecture not yet in videos, inserted in one statement;
+# the unique index on title makes lectures already present a no-op
+_SYNC_SQL = """
+    INSERT INTO videos (date, title, url, category, notes, rating, watched)
+    SELECT ?, json_extract(value, '$[0]'), json_extract(value, '$[1]'), json_extract(value, '$[2]'), '', 5, 0
+    FROM json_each(?)
+    WHERE true
+    ON CONFLICT (title) DO NOTHING
+"""
+
+# Only watched lectures are read back, straight from idx_videos_watched_title
+_WATCHED_SQL = "SELECT title FROM videos WHERE watched = 1"
+
+
+def _validate(df):
+    """
+    Check every catalog row against TOPIC_SUBTOPICS; raises ValueError naming bad rows.
+
+    Row numbers are file lines, counting the header as line 1.
+    """
+    errors = []
+    valid_topics = {(section, topic) for section, topics in TOPIC_SUBTOPICS.items() for topic in topics}
+    for line, section, topic, subtopic, code, url in zip(df.index + 2, df["Section"], df["Topic"],
+                                                         df["Subtopic"], df["Code"], df["URL"]):
+        if section not in TOPIC_SUBTOPICS:
+            errors.append(f"line {line}: unknown section {section!r}")
+        elif (section, topic) not in valid_topics:
+            errors.append(f"line {line}: {topic!r} is not a {section} topic")
+        elif not subtopic or not code:
+            errors.append(f"line {line}: subtopic and code are required")
+        elif not url.startswith(("http://", "https://")):
+            errors.append(f"line {line}: URL must start with http:// or https://")
+
+    for line, title in zip(df.index[df["Title"].duplicated()] + 2, df["Title"][df["Title"].duplicated()]):
+        errors.append(f"line {line}: duplicate lecture {title!r}")
+
+    if errors:
+        more = f" (and {len(errors) - 5} more)" if len(errors) > 5 else ""
+        raise ValueError("; ".join(errors[:5]) + more)
+
+
+def parse_catalog(data):
+    """
+    Parse and validate catalog CSV bytes into a DataFrame with a Title column matching videos.title.
+
+    The frame's attrs["catalog_hash"] is the SHA-256 of the raw bytes.
+    """
+    df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False, encoding="utf-8")
+    missing = [column for column in CATALOG_COLUMNS if column not in df.columns]
+    if missing:
+        raise ValueError(f"Lecture catalog is missing column(s): {', '.join(missing)}")
+
+    df = df[CATALOG_COLUMNS].apply(lambda column: column.str.strip())
+    df["Title"] = df["Subtopic"] + " (" + df["Code"] + ")"
+    _validate(df)
+    df.attrs["catalog_hash"] = hashlib.sha256(data).hexdigest()
+    return df
+
+
+def load_catalog(path=LECTURE_CATALOG_FILE):
+    """
+    The parsed lecture catalog, re-read only when the file changes.
+
+    A stat() per call checks mtime and size; when either moved, the file is
+    re-read and only re-parsed if its content hash differs, so a touched but
+    unchanged file costs one read. Treat the returned frame as read-only.
+    """
+    global _cached
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+    with _cache_lock:
+        if _cached is not None and _cached[0] == key:
+            return _cached[1]
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    with _cache_lock:
+        if _cached is not None and _cached[1].attrs["catalog_hash"] == hashlib.sha256(data).hexdigest():
+            _cached = (key, _cached[1])
+            return _cached[1]
+
+    df = parse_catalog(data)
+    with _cache_lock:
+        _cached = (key, df)
+    return df
+
+
+def sync_catalog(df):
+    """
+    Insert lectures from a load_catalog() frame that are missing from videos,
+    if the catalog changed since the last sync.
+
+    The whole catalog goes in as one INSERT ... ON CONFLICT DO NOTHING inside
+    a single transaction, and the catalog hash is stored with it, so an
+    unchanged catalog costs one lookup. Returns True when a sync ran.
+    """
+    digest = df.attrs["catalog_hash"]
+    if digest is None:
+        return False
+    with transaction() as conn:
+        row = conn.execute("SELECT catalog_hash FROM lecture_catalog_sync WHERE id = 1").fetchone()
+        if row is not None and row[0] == digest:
+            return False
+
+        lectures = json.dumps(df[["Title", "URL", "Section"]].values.tolist(), ensure_ascii=False)
+        conn.execute(_SYNC_SQL, (datetime.now().strftime('%Y-%m-%d'), lectures))
+        conn.execute("""
+            INSERT INTO lecture_catalog_sync (id, catalog_hash, synced_at) VALUES (1, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET catalog_hash = excluded.catalog_hash, synced_at = excluded.synced_at
+        """, (digest, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    return True
+
+
+def empty_catalog():
+    """A catalog frame with no lectures, for when the catalog file cannot be loaded"""
+    df = pd.DataFrame(columns=CATALOG_COLUMNS + ["Title"])
+    df.attrs["catalog_hash"] = None
+    return df
+
+
+def with_watched_status(c, df):
+    """Copy of the catalog with a Watched ✅/⬜ column, read back in one query"""
+    watched = {title for (title,) in c.execute(_WATCHED_SQL).fetchall()}
+    df = df.copy()
+    df["Watched"] = df["Title"].isin(watched).map({True: "✅", False: "⬜"})
+    return df
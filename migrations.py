@@ -0,0 +1,504 @@
+import argparse
+import sqlite3
+
+from config import FLASHCARD_MASTERED_DAYS
+from db import connect
+from rollups import rebuild_daily_rollup, rebuild_study_streak, rebuild_note_tags, rebuild_notes_fts
+
+
+def _columns(c, table):
+    c.execute(f"PRAGMA table_info({table})")
+    return [info[1] for info in c.fetchall()]
+
+
+def _add_column(c, table, column, definition):
+    """Add a column unless an older version of the table already has it"""
+    if column not in _columns(c, table):
+        c.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+    return False
+
+
+def _rebuild_table(c, table, create_sql):
+    """
+    Recreate a table from new DDL, keeping its rows, rowids, indexes and triggers.
+
+    create_sql must create `{table}_new`; columns the old table also has are
+    copied and the old rowid becomes the new table's INTEGER PRIMARY KEY `id`.
+    """
+    c.execute("SELECT sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+              (table,))
+    dependents = [row[0] for row in c.fetchall()]
+
+    c.execute(create_sql)
+    shared = [col for col in _columns(c, f"{table}_new") if col in _columns(c, table)]
+    c.execute(f"INSERT INTO {table}_new (id, {', '.join(shared)}) SELECT rowid, {', '.join(shared)} FROM {table}")
+    c.execute(f"DROP TABLE {table}")
+    c.execute(f"ALTER TABLE {table}_new RENAME TO {table}")
+
+    for sql in dependents:
+        c.execute(sql)
+
+
+def _baseline_schema(c):
+    """Core tables, plus the columns older databases were created without"""
+    # Progress tracking table
+    c.execute('''CREATE TABLE IF NOT EXISTS progress
+                 (date TEXT, section TEXT, topic TEXT, subtopic TEXT, score REAL)''')
+    _add_column(c, "progress", "subtopic", "TEXT")
+
+    # Study log table
+    c.execute('''CREATE TABLE IF NOT EXISTS study_log
+                 (date TEXT, topic TEXT, subtopic TEXT, time_spent INTEGER, notes TEXT)''')
+    _add_column(c, "study_log", "date", "TEXT")
+    if _add_column(c, "study_log", "subtopic", "TEXT"):
+        # Give sessions logged before subtopics existed a sensible default
+        c.execute("UPDATE study_log SET subtopic = 'Reading Comprehension' WHERE topic = 'VARC' AND subtopic IS NULL")
+        c.execute("UPDATE study_log SET subtopic = 'Data Interpretation' WHERE topic = 'DILR' AND subtopic IS NULL")
+        c.execute("UPDATE study_log SET subtopic = 'Algebra' WHERE topic = 'Quant' AND subtopic IS NULL")
+
+    # Flashcards table
+    c.execute('''CREATE TABLE IF NOT EXISTS flashcards
+                 (word TEXT, definition TEXT, usage TEXT, category TEXT, mastered BOOLEAN, date TEXT)''')
+    _add_column(c, "flashcards", "date", "TEXT")
+
+    # Questions table
+    c.execute('''CREATE TABLE IF NOT EXISTS questions
+                 (date TEXT, question TEXT, answer TEXT, topic TEXT, difficulty TEXT, correct INTEGER DEFAULT 0)''')
+    _add_column(c, "questions", "correct", "INTEGER DEFAULT 0")
+
+    # Notes table
+    c.execute('''CREATE TABLE IF NOT EXISTS notes
+                 (date TEXT, title TEXT, content TEXT, tags TEXT)''')
+
+    # Lecture videos table
+    c.execute('''CREATE TABLE IF NOT EXISTS videos
+                 (date TEXT, title TEXT, url TEXT, category TEXT, notes TEXT, rating INTEGER, watched BOOLEAN DEFAULT 0)''')
+    _add_column(c, "videos", "watched", "BOOLEAN DEFAULT 0")
+
+    # Productivity settings table
+    c.execute('''CREATE TABLE IF NOT EXISTS productivity_settings
+                 (user_id TEXT, focus_duration INTEGER DEFAULT 25, break_duration INTEGER DEFAULT 5,
+                  reminder_frequency TEXT, notification_enabled BOOLEAN DEFAULT 0,
+                  daily_goal INTEGER DEFAULT 120, reminder_time TEXT DEFAULT '09:00')''')
+    _add_column(c, "productivity_settings", "daily_goal", "INTEGER DEFAULT 120")
+    _add_column(c, "productivity_settings", "reminder_time", "TEXT DEFAULT '09:00'")
+
+    # Timer logs table
+    c.execute('''CREATE TABLE IF NOT EXISTS timer_logs
+                 (date TEXT, start_time TEXT, end_time TEXT, duration INTEGER,
+                  completed BOOLEAN, topic TEXT)''')
+
+
+def _hot_path_indexes(c):
+    """Indexes for the date filters and topic/section groupings the pages run on every render"""
+    c.execute("CREATE INDEX IF NOT EXISTS idx_study_log_date ON study_log(date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_study_log_topic_date ON study_log(topic, date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_progress_section_date ON progress(section, date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_progress_date ON progress(date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_progress_topic_subtopic ON progress(topic, subtopic)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_questions_topic_difficulty ON questions(topic, difficulty)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_flashcards_category_mastered ON flashcards(category, mastered)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_videos_title ON videos(title)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_videos_category_title ON videos(category, title)")
+
+
+def _daily_study_rollup(c):
+    """Per-day study totals maintained by triggers, so charts scale with days rather than sessions"""
+    c.execute('''CREATE TABLE IF NOT EXISTS daily_study_rollup
+                 (date TEXT NOT NULL, topic TEXT NOT NULL, subtopic TEXT NOT NULL,
+                  total_minutes INTEGER NOT NULL DEFAULT 0, session_count INTEGER NOT NULL DEFAULT 0,
+                  PRIMARY KEY (date, topic, subtopic)) WITHOUT ROWID''')
+
+    c.execute('''CREATE TRIGGER IF NOT EXISTS study_log_rollup_insert AFTER INSERT ON study_log
+                 BEGIN
+                     INSERT INTO daily_study_rollup (date, topic, subtopic, total_minutes, session_count)
+                     VALUES (COALESCE(NEW.date, ''), COALESCE(NEW.topic, ''), COALESCE(NEW.subtopic, ''),
+                             COALESCE(NEW.time_spent, 0), 1)
+                     ON CONFLICT (date, topic, subtopic) DO UPDATE
+                     SET total_minutes = total_minutes + excluded.total_minutes,
+                         session_count = session_count + 1;
+                 END''')
+
+    c.execute('''CREATE TRIGGER IF NOT EXISTS study_log_rollup_delete AFTER DELETE ON study_log
+                 BEGIN
+                     UPDATE daily_study_rollup
+                     SET total_minutes = total_minutes - COALESCE(OLD.time_spent, 0),
+                         session_count = session_count - 1
+                     WHERE date = COALESCE(OLD.date, '') AND topic = COALESCE(OLD.topic, '')
+                       AND subtopic = COALESCE(OLD.subtopic, '');
+                     DELETE FROM daily_study_rollup WHERE session_count <= 0;
+                 END''')
+
+    c.execute('''CREATE TRIGGER IF NOT EXISTS study_log_rollup_update
+                 AFTER UPDATE OF date, topic, subtopic, time_spent ON study_log
+                 BEGIN
+                     UPDATE daily_study_rollup
+                     SET total_minutes = total_minutes - COALESCE(OLD.time_spent, 0),
+                         session_count = session_count - 1
+                     WHERE date = COALESCE(OLD.date, '') AND topic = COALESCE(OLD.topic, '')
+                       AND subtopic = COALESCE(OLD.subtopic, '');
+                     DELETE FROM daily_study_rollup WHERE session_count <= 0;
+                     INSERT INTO daily_study_rollup (date, topic, subtopic, total_minutes, session_count)
+                     VALUES (COALESCE(NEW.date, ''), COALESCE(NEW.topic, ''), COALESCE(NEW.subtopic, ''),
+                             COALESCE(NEW.time_spent, 0), 1)
+                     ON CONFLICT (date, topic, subtopic) DO UPDATE
+                     SET total_minutes = total_minutes + excluded.total_minutes,
+                         session_count = session_count + 1;
+                 END''')
+
+    # Backfill from the sessions logged so far
+    rebuild_daily_rollup(c)
+
+
+def _study_streak(c):
+    """Single-row streak state, advanced by save_study_session instead of rescanning every date"""
+    c.execute('''CREATE TABLE IF NOT EXISTS study_streak
+                 (id INTEGER PRIMARY KEY CHECK (id = 1),
+                  current_streak INTEGER NOT NULL DEFAULT 0, longest_streak INTEGER NOT NULL DEFAULT 0,
+                  last_study_date TEXT)''')
+
+    # Backfill from the days already in the rollup
+    rebuild_study_streak(c)
+
+
+def _note_tags(c):
+    """One row per (tag, note) so the tag filter is an index lookup instead of LIKE '%tag%'"""
+    c.execute('''CREATE TABLE IF NOT EXISTS note_tags
+                 (tag TEXT NOT NULL COLLATE NOCASE, note_rowid INTEGER NOT NULL,
+                  PRIMARY KEY (tag, note_rowid)) WITHOUT ROWID''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_note_tags_note ON note_tags(note_rowid)")
+
+    # Inserts and tag edits are synced by the writers; deletes are caught here
+    c.execute('''CREATE TRIGGER IF NOT EXISTS notes_tags_delete AFTER DELETE ON notes
+                 BEGIN
+                     DELETE FROM note_tags WHERE note_rowid = OLD.rowid;
+                 END''')
+
+    # Backfill from the comma-separated tags already stored on notes
+    rebuild_note_tags(c)
+
+
+def _notes_fts(c):
+    """FTS5 index over notes for ranked, prefix-aware search with snippets"""
+    # External-content table: the text lives in notes, the index in notes_fts
+    c.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5
+                 (title, content, tags, content='notes', content_rowid='rowid',
+                  tokenize='unicode61 remove_diacritics 2', prefix='2 3')''')
+
+    c.execute('''CREATE TRIGGER IF NOT EXISTS notes_fts_insert AFTER INSERT ON notes
+                 BEGIN
+                     INSERT INTO notes_fts (rowid, title, content, tags)
+                     VALUES (NEW.rowid, NEW.title, NEW.content, NEW.tags);
+                 END''')
+
+    c.execute('''CREATE TRIGGER IF NOT EXISTS notes_fts_delete AFTER DELETE ON notes
+                 BEGIN
+                     INSERT INTO notes_fts (notes_fts, rowid, title, content, tags)
+                     VALUES ('delete', OLD.rowid, OLD.title, OLD.content, OLD.tags);
+                 END''')
+
+    c.execute('''CREATE TRIGGER IF NOT EXISTS notes_fts_update AFTER UPDATE OF title, content, tags ON notes
+                 BEGIN
+                     INSERT INTO notes_fts (notes_fts, rowid, title, content, tags)
+                     VALUES ('delete', OLD.rowid, OLD.title, OLD.content, OLD.tags);
+                     INSERT INTO notes_fts (rowid, title, content, tags)
+                     VALUES (NEW.rowid, NEW.title, NEW.content, NEW.tags);
+                 END''')
+
+    # Index the notes written so far
+    rebuild_notes_fts(c)
+
+
+def _flashcard_scheduling(c):
+    """SM-2 scheduling state per flashcard, a review log, and the due_at queue index"""
+    _add_column(c, "flashcards", "ease", "REAL NOT NULL DEFAULT 2.5")
+    _add_column(c, "flashcards", "interval_days", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(c, "flashcards", "repetitions", "INTEGER NOT NULL DEFAULT 0")
+    _add_column(c, "flashcards", "due_at", "TEXT")
+
+    # Cards already marked mastered start on the mastered interval; the rest are due now
+    c.execute('''UPDATE flashcards
+                 SET interval_days = ?, repetitions = 3, due_at = datetime('now', 'localtime', ?)
+                 WHERE mastered = 1 AND due_at IS NULL''',
+              (FLASHCARD_MASTERED_DAYS, f"+{FLASHCARD_MASTERED_DAYS} days"))
+    c.execute('''UPDATE flashcards
+                 SET due_at = COALESCE(date, strftime('%Y-%m-%d', 'now', 'localtime')) || ' 00:00:00'
+                 WHERE due_at IS NULL''')
+
+    # New cards are due immediately, whichever code path inserted them
+    c.execute('''CREATE TRIGGER IF NOT EXISTS flashcards_due_on_insert AFTER INSERT ON flashcards
+                 WHEN NEW.due_at IS NULL
+                 BEGIN
+                     UPDATE flashcards SET due_at = datetime('now', 'localtime') WHERE rowid = NEW.rowid;
+                 END''')
+
+    c.execute("CREATE INDEX IF NOT EXISTS idx_flashcards_due ON flashcards(due_at)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_flashcards_category_due ON flashcards(category, due_at)")
+
+    c.execute('''CREATE TABLE IF NOT EXISTS flashcard_reviews
+                 (card_rowid INTEGER NOT NULL, reviewed_at TEXT NOT NULL, grade INTEGER NOT NULL,
+                  ease REAL, interval_days INTEGER, due_at TEXT)''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_flashcard_reviews_card ON flashcard_reviews(card_rowid, reviewed_at)")
+
+
+def _pagination_indexes(c):
+    """Single-column filter indexes whose implicit rowid suffix serves rowid-ordered keyset pages"""
+    c.execute("CREATE INDEX IF NOT EXISTS idx_questions_topic ON questions(topic)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_questions_difficulty ON questions(difficulty)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_flashcards_category ON flashcards(category)")
+
+
+def _integer_primary_keys(c):
+    """Explicit INTEGER PRIMARY KEY ids so updates address one row instead of matching text"""
+    # Existing rowids are kept as the ids, so note_tags, notes_fts and
+    # flashcard_reviews keep pointing at the same rows
+    _rebuild_table(c, "flashcards", '''CREATE TABLE flashcards_new
+                 (id INTEGER PRIMARY KEY, word TEXT, definition TEXT, usage TEXT, category TEXT,
+                  mastered BOOLEAN, date TEXT, ease REAL NOT NULL DEFAULT 2.5,
+                  interval_days INTEGER NOT NULL DEFAULT 0, repetitions INTEGER NOT NULL DEFAULT 0,
+                  due_at TEXT)''')
+    _rebuild_table(c, "questions", '''CREATE TABLE questions_new
+                 (id INTEGER PRIMARY KEY, date TEXT, question TEXT, answer TEXT, topic TEXT,
+                  difficulty TEXT, correct INTEGER DEFAULT 0)''')
+    _rebuild_table(c, "notes", '''CREATE TABLE notes_new
+                 (id INTEGER PRIMARY KEY, date TEXT, title TEXT, content TEXT, tags TEXT)''')
+    _rebuild_table(c, "study_log", '''CREATE TABLE study_log_new
+                 (id INTEGER PRIMARY KEY, date TEXT, topic TEXT, subtopic TEXT, time_spent INTEGER, notes TEXT)''')
+
+
+def _question_attempts(c):
+    """Per-attempt question history plus a (topic, difficulty, day) accuracy rollup kept by triggers"""
+    c.execute('''CREATE TABLE IF NOT EXISTS question_attempts
+                 (id INTEGER PRIMARY KEY, question_id INTEGER NOT NULL, attempted_at TEXT NOT NULL,
+                  correct INTEGER NOT NULL, time_taken_seconds INTEGER)''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_question_attempts_question ON question_attempts(question_id, attempted_at)")
+
+    c.execute('''CREATE TABLE IF NOT EXISTS question_accuracy_daily
+                 (topic TEXT NOT NULL, difficulty TEXT NOT NULL, date TEXT NOT NULL,
+                  attempts INTEGER NOT NULL DEFAULT 0, correct INTEGER NOT NULL DEFAULT 0,
+                  total_seconds INTEGER NOT NULL DEFAULT 0,
+                  PRIMARY KEY (topic, difficulty, date)) WITHOUT ROWID''')
+
+    # Each attempt bumps its day's bucket and becomes the question's latest status
+    c.execute('''CREATE TRIGGER IF NOT EXISTS question_attempts_rollup_insert AFTER INSERT ON question_attempts
+                 BEGIN
+                     INSERT INTO question_accuracy_daily (topic, difficulty, date, attempts, correct, total_seconds)
+                     SELECT COALESCE(topic, ''), COALESCE(difficulty, ''), date(NEW.attempted_at),
+                            1, NEW.correct, COALESCE(NEW.time_taken_seconds, 0)
+                     FROM questions WHERE id = NEW.question_id
+                     ON CONFLICT (topic, difficulty, date) DO UPDATE
+                     SET attempts = attempts + 1,
+                         correct = correct + excluded.correct,
+                         total_seconds = total_seconds + excluded.total_seconds;
+                     UPDATE questions SET correct = NEW.correct WHERE id = NEW.question_id;
+                 END''')
+
+    # Seed the history with one attempt, on the day it was added, for each question
+    # marked correct. correct = 0 is also what a never-attempted question holds, so
+    # those rows are left without history rather than counted as wrong answers
+    c.execute('''INSERT INTO question_attempts (question_id, attempted_at, correct)
+                 SELECT id, COALESCE(date, strftime('%Y-%m-%d', 'now', 'localtime')) || ' 00:00:00', 1
+                 FROM questions
+                 WHERE correct = 1''')
+
+
+def _practice_buckets(c):
+    """(topic, difficulty, correct) index so adaptive practice draws a question with one seek"""
+    c.execute("CREATE INDEX IF NOT EXISTS idx_questions_bucket ON questions(topic, difficulty, correct)")
+
+
+def _unique_video_titles(c):
+    """One videos row per title, enforced by a unique index, plus the lecture catalog sync state"""
+    # A title watched under any of its duplicate rows stays watched on the row that is kept
+    c.execute('''UPDATE videos SET watched = 1
+                 WHERE rowid IN (SELECT MIN(rowid) FROM videos WHERE title IS NOT NULL
+                                 GROUP BY title HAVING COUNT(*) > 1 AND MAX(watched) = 1)''')
+    c.execute('''DELETE FROM videos
+                 WHERE title IS NOT NULL
+                   AND rowid NOT IN (SELECT MIN(rowid) FROM videos WHERE title IS NOT NULL GROUP BY title)''')
+
+    c.execute("DROP INDEX IF EXISTS idx_videos_title")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_videos_title_unique ON videos(title)")
+
+    # Hash of the catalog last synced into videos
+    c.execute('''CREATE TABLE IF NOT EXISTS lecture_catalog_sync
+                 (id INTEGER PRIMARY KEY CHECK (id = 1), catalog_hash TEXT NOT NULL, synced_at TEXT)''')
+
+
+def _watched_videos_index(c):
+    """(watched, title) index so reading back watched lectures touches only the watched rows"""
+    c.execute("CREATE INDEX IF NOT EXISTS idx_videos_watched_title ON videos(watched, title)")
+
+
+def _timer_journal(c):
+    """Append-only timer event journal, and session ids so a timed session is logged at most once"""
+    c.execute('''CREATE TABLE IF NOT EXISTS timer_events
+                 (id INTEGER PRIMARY KEY, session_id TEXT NOT NULL, event TEXT NOT NULL, at REAL NOT NULL,
+                  phase TEXT, duration_seconds INTEGER, topic TEXT, subtopic TEXT)''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_timer_events_session ON timer_events(session_id, id)")
+
+    # Rows logged by hand or before the journal keep a NULL session_id
+    _add_column(c, "study_log", "session_id", "TEXT")
+    _add_column(c, "timer_logs", "session_id", "TEXT")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_study_log_session ON study_log(session_id) WHERE session_id IS NOT NULL")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_timer_logs_session ON timer_logs(session_id) WHERE session_id IS NOT NULL")
+
+
+# Uniform over [0, 1]; random() is a signed 64-bit integer
+_RAND_KEY = "(random() / 18446744073709551616.0 + 0.5)"
+
+
+def _question_sample_keys(c):
+    """A uniform random key per question, indexed within each bucket so practice sets sample evenly"""
+    _add_column(c, "questions", "rand_key", "REAL")
+    c.execute(f"UPDATE questions SET rand_key = {_RAND_KEY} WHERE rand_key IS NULL")
+
+    # Every new question gets a key, whichever code path inserted it
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS questions_rand_key_insert AFTER INSERT ON questions
+                  WHEN NEW.rand_key IS NULL
+                  BEGIN
+                      UPDATE questions SET rand_key = {_RAND_KEY} WHERE id = NEW.id;
+                  END''')
+
+    # Replaces the (topic, difficulty, correct) index, which is a prefix of this one
+    c.execute("DROP INDEX IF EXISTS idx_questions_bucket")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_questions_bucket_key ON questions(topic, difficulty, correct, rand_key)")
+
+
+def _mastered_flashcards_on_insert(c):
+    """Cards inserted as mastered start on the mastered interval, as migration 7 scheduled existing ones"""
+    mastered = f"interval_days = {FLASHCARD_MASTERED_DAYS}, repetitions = 3, " \
+               f"due_at = datetime('now', 'localtime', '+{FLASHCARD_MASTERED_DAYS} days')"
+
+    # Mastered cards the old trigger made due now, and that have not been reviewed since
+    c.execute(f'''UPDATE flashcards SET {mastered}
+                  WHERE mastered = 1 AND repetitions = 0 AND interval_days = 0''')
+
+    c.execute("DROP TRIGGER IF EXISTS flashcards_due_on_insert")
+    c.execute('''CREATE TRIGGER flashcards_due_on_insert AFTER INSERT ON flashcards
+                 WHEN NEW.due_at IS NULL AND COALESCE(NEW.mastered, 0) != 1
+                 BEGIN
+                     UPDATE flashcards SET due_at = datetime('now', 'localtime') WHERE rowid = NEW.rowid;
+                 END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS flashcards_mastered_on_insert AFTER INSERT ON flashcards
+                  WHEN NEW.due_at IS NULL AND NEW.mastered = 1
+                  BEGIN
+                      UPDATE flashcards SET {mastered} WHERE rowid = NEW.rowid;
+                  END''')
+
+
+# Ordered (version, description, apply) entries. Never edit or reorder a
+# released migration; append a new one instead.
+MIGRATIONS = [
+    (1, "Baseline schema and legacy column backfill", _baseline_schema),
+    (2, "Indexes for date, topic and section lookups", _hot_path_indexes),
+    (3, "Trigger-maintained daily study rollup", _daily_study_rollup),
+    (4, "Persisted study streak", _study_streak),
+    (5, "Normalized note tags", _note_tags),
+    (6, "Full-text search index for notes", _notes_fts),
+    (7, "Spaced-repetition scheduling for flashcards", _flashcard_scheduling),
+    (8, "Indexes for keyset pagination", _pagination_indexes),
+    (9, "INTEGER PRIMARY KEY ids for flashcards, questions, notes and study_log", _integer_primary_keys),
+    (10, "Question attempt history and daily accuracy rollup", _question_attempts),
+    (11, "Index for adaptive practice sampling", _practice_buckets),
+    (12, "Unique lecture titles and catalog sync state", _unique_video_titles),
+    (13, "Index for watched lectures", _watched_videos_index),
+    (14, "Timer event journal and idempotent timer session logging", _timer_journal),
+    (15, "Random sampling keys for adaptive practice", _question_sample_keys),
+    (16, "Mastered flashcards inserted on the mastered interval", _mastered_flashcards_on_insert),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def current_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending_migrations(conn):
+    """Migrations newer than the database's user_version, in the order they will run"""
+    version = current_version(conn)
+    return [m for m in MIGRATIONS if m[0] > version]
+
+
+def migrate(conn=None):
+    """
+    Bring the database schema up to LATEST_VERSION.
+
+    Each migration runs in its own transaction together with the user_version
+    bump, so an interrupted upgrade resumes where it stopped. Returns the list
+    of versions that were applied.
+    """
+    own_conn = conn is None
+    if own_conn:
+        conn = connect()
+
+    applied = []
+    try:
+        if current_version(conn) >= LATEST_VERSION:
+            return applied
+
+        c = conn.cursor()
+        for version, description, apply in MIGRATIONS:
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-check under the write lock in case another process got here first
+                if current_version(conn) >= version:
+                    conn.rollback()
+                    continue
+                apply(c)
+                c.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            applied.append(version)
+    finally:
+        if own_conn:
+            conn.close()
+
+    return applied
+
+
+def reset_schema(conn):
+    """Drop every user table and rewind user_version so migrate() rebuilds from scratch"""
+    c = conn.cursor()
+    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'")
+    tables = [table[0] for table in c.fetchall()]
+
+    for table in tables:
+        try:
+            c.execute(f"DROP TABLE IF EXISTS {table}")
+        except sqlite3.OperationalError:
+            pass  # Shadow table already removed with its parent
+
+    c.execute("PRAGMA user_version = 0")
+    conn.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the CAT Prep Tracker database schema")
+    parser.add_argument("command", nargs="?", default="status", choices=["status", "upgrade"],
+                        help="show the schema version (default) or apply pending migrations")
+    args = parser.parse_args()
+
+    conn = connect()
+    try:
+        if args.command == "upgrade":
+            applied = migrate(conn)
+            if applied:
+                print(f"Applied migrations: {', '.join(str(v) for v in applied)}")
+            else:
+                print("Database is already up to date.")
+
+        print(f"Current schema version: {current_version(conn)} (latest: {LATEST_VERSION})")
+        pending = pending_migrations(conn)
+        if pending:
+            print("Pending migrations:")
+            for version, description, _ in pending:
+                print(f"  {version}: {description}")
+        else:
+            print("No pending migrations.")
+    finally:
+        conn.close()
@@ -1,10 +1,11 @@
 import streamlit as st
 from datetime import datetime, timedelta
-import sqlite3
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils import save_study_session, save_timer_session
+from db import connect
+from timer_engine import load_settings
+from timer_ui import show_timer_controls
 
 # Define a consistent color palette
 COLOR_PALETTE = {
@@ -19,18 +20,6 @@ COLOR_PALETTE = {
 # Define a consistent color sequence for charts
 COLOR_SEQUENCE = ["#4F46E5", "#06B6D4", "#10B981", "#F97316", "#8B5CF6", "#64748B"]
 
-def init_db():
-    """Initialize database connection"""
-    conn = sqlite3.connect('cat_prep.db')
-    c = conn.cursor()
-
-    # Ensure study_log table exists
-    c.execute('''CREATE TABLE IF NOT EXISTS study_log
-                 (date TEXT, topic TEXT, subtopic TEXT, time_spent INTEGER, notes TEXT)''')
-
-    conn.commit()
-    return conn
-
 def show_focus_timer():
     """Display a minimal focus timer with analysis section"""
     st.title("Focus Timer")
@@ -77,58 +66,16 @@ def show_focus_timer():
     """, unsafe_allow_html=True)
 
     # Initialize database connection
-    conn = init_db()
+    conn = connect()
     c = conn.cursor()
 
     # Create tabs for Timer and Analysis
     tab1, tab2 = st.tabs(["⏱️ Timer", "📊 Analysis"])
 
     with tab1:
-        # Topic selector for focus sessions
-        topic = st.selectbox(
-            "What are you working on?",
-            ["VARC", "DILR", "Quant", "General Preparation", "Mock Test", "Other"]
-        )
-
-        # Embed only the timer part of Pomofocus.io in an iframe with custom CSS
-        st.markdown("""
-        <style>
-        iframe {
-            border: none;
-            width: 100%;
-            height: 500px;
-            overflow: hidden;
-            border-radius: 8px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }
-        </style>
-
-        <div style="margin-bottom: 20px;">
-            <iframe src="https://pomofocus.io/" scrolling="no"></iframe>
-        </div>
-        """, unsafe_allow_html=True)
-
-        # Simple form to record completed sessions
+        # Completed sessions are saved as soon as the countdown ends
         st.markdown('<div class="stat-card">', unsafe_allow_html=True)
-        st.markdown('<div class="section-header">Record Completed Session</div>', unsafe_allow_html=True)
-
-        with st.form("record_session"):
-            col1, col2 = st.columns([3, 1])
-
-            with col1:
-                minutes_spent = st.number_input("Minutes completed", min_value=1, max_value=180, value=25)
-
-            with col2:
-                record_button = st.form_submit_button("Save Session")
-
-            if record_button:
-                try:
-                    # Save to database
-                    save_study_session(topic, "", minutes_spent)
-                    st.success(f"Saved {minutes_spent} minutes of study on {topic}")
-                except Exception as e:
-                    st.error(f"Error saving session: {str(e)}")
-
+        show_timer_controls(load_settings())
         st.markdown('</div>', unsafe_allow_html=True)
 
     with tab2:
@@ -144,8 +91,8 @@ def show_focus_timer():
 
         # Get study data from database
         c.execute("""
-            SELECT date, topic, SUM(time_spent) as total_time
-            FROM study_log
+            SELECT date, topic, SUM(total_minutes) as total_time, SUM(session_count) as sessions
+            FROM daily_study_rollup
             WHERE date BETWEEN ? AND ?
             GROUP BY date, topic
             ORDER BY date
@@ -155,7 +102,7 @@ def show_focus_timer():
 
         if data:
             # Convert to DataFrame
-            df = pd.DataFrame(data, columns=['date', 'topic', 'minutes'])
+            df = pd.DataFrame(data, columns=['date', 'topic', 'minutes', 'sessions'])
 
             # Total study time
             total_time = df['minutes'].sum()
@@ -221,7 +168,7 @@ def show_focus_timer():
 
             # Topic breakdown table
             st.subheader("Topic Breakdown")
-            topic_breakdown = df.groupby('topic')['minutes'].agg(['sum', 'count']).reset_index()
+            topic_breakdown = df.groupby('topic')[['minutes', 'sessions']].sum().reset_index()
             topic_breakdown.columns = ['Topic', 'Total Minutes', 'Sessions']
             topic_breakdown['Average Minutes/Session'] = round(topic_breakdown['Total Minutes'] / topic_breakdown['Sessions'], 1)
             topic_breakdown['Hours'] = round(topic_breakdown['Total Minutes'] / 60, 1)
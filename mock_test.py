@@ -0,0 +1,223 @@
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from config import DIFFICULTY_LEVELS, MOCK_TEST_FLUSH_SIZE, MOCK_TEST_SECTIONS
+from db import transaction
+from practice import draw_question, fetch_questions
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Subtopic under which sectional mock scores are logged in progress
+MOCK_TEST_SUBTOPIC = "Mock Test"
+
+# CAT marking: +3 for a correct answer, -1 for a wrong one, 0 when skipped
+MARKS_CORRECT = 3
+MARKS_INCORRECT = -1
+
+
+def assemble_paper(c, sections=MOCK_TEST_SECTIONS, rng=None):
+    """
+    Section -> question rows for a full paper drawn from the question bank.
+
+    Difficulties are taken in turn so each section gets an even mix, falling
+    back to whatever the bank has. Every question is one index seek, so the
+    paper costs the same however large the bank is. A section comes back
+    short when the bank does not have enough questions for it.
+    """
+    rng = rng or random.Random()
+    paper = {}
+    for section, (count, _minutes) in sections.items():
+        chosen = []
+        while len(chosen) < count:
+            # Rotate the starting difficulty so Easy/Medium/Hard alternate
+            start = len(chosen) % len(DIFFICULTY_LEVELS)
+            order = DIFFICULTY_LEVELS[start:] + DIFFICULTY_LEVELS[:start]
+            question_id = None
+            for difficulty in order:
+                question_id = draw_question(c, section, difficulty, chosen, rng, missed_share=0.5)
+                if question_id is not None:
+                    break
+            if question_id is None:
+                break
+            chosen.append(question_id)
+        paper[section] = fetch_questions(c, chosen)
+    return paper
+
+
+def section_score(correct, incorrect, total):
+    """Sectional score out of 100 under CAT marking, floored at zero"""
+    if total <= 0:
+        return 0.0
+    marks = correct * MARKS_CORRECT + incorrect * MARKS_INCORRECT
+    return round(max(marks, 0) / (total * MARKS_CORRECT) * 100, 1)
+
+
+class AttemptBuffer:
+    """
+    Question attempts held in memory and written to question_attempts in batches.
+
+    add() only writes once flush_size attempts are pending, so answering a
+    question costs no database round trip. flush() writes whatever is left,
+    optionally inside a caller's transaction.
+    """
+
+    def __init__(self, flush_size=MOCK_TEST_FLUSH_SIZE):
+        self.flush_size = flush_size
+        self.pending = []
+
+    def add(self, question_id, correct, time_taken_seconds=None, attempted_at=None):
+        attempted_at = (attempted_at or datetime.now()).strftime(TIMESTAMP_FORMAT)
+        self.pending.append((question_id, attempted_at, 1 if correct else 0,
+                             int(time_taken_seconds) if time_taken_seconds else None))
+        if len(self.pending) >= self.flush_size:
+            self.flush()
+
+    def flush(self, conn=None):
+        """Write the pending attempts; returns how many were written"""
+        if not self.pending:
+            return 0
+        if conn is None:
+            with transaction() as conn:
+                return self.flush(conn)
+
+        conn.executemany("""
+            INSERT INTO question_attempts (question_id, attempted_at, correct, time_taken_seconds)
+            VALUES (?, ?, ?, ?)
+        """, self.pending)
+        written = len(self.pending)
+        self.pending = []
+        return written
+
+
+@dataclass
+class SectionResult:
+    total: int
+    correct: int = 0
+    incorrect: int = 0
+    skipped: int = 0
+
+    @property
+    def score(self):
+        return section_score(self.correct, self.incorrect, self.total)
+
+
+@dataclass
+class MockTest:
+    """
+    One sitting of a mock test, kept in session state between reruns.
+
+    Sections are sat in order with their own time limit; a section ends when
+    its last question is answered, when it is ended early, or when its time
+    runs out. Times are epoch seconds so the state survives reruns.
+    """
+    paper: dict
+    minutes: dict
+    buffer: AttemptBuffer = field(default_factory=AttemptBuffer)
+    results: dict = field(default_factory=dict)
+    section_index: int = 0
+    question_index: int = 0
+    section_started_at: float = None
+    question_started_at: float = None
+    finished: bool = False
+
+    @classmethod
+    def start(cls, c, sections=MOCK_TEST_SECTIONS, now=None, rng=None):
+        paper = {section: rows for section, rows in assemble_paper(c, sections, rng).items() if rows}
+        test = cls(paper=paper, minutes={section: sections[section][1] for section in paper},
+                   results={section: SectionResult(len(rows)) for section, rows in paper.items()})
+        test._start_section(now)
+        return test
+
+    @property
+    def sections(self):
+        return list(self.paper)
+
+    @property
+    def current_section(self):
+        return self.sections[self.section_index] if self.section_index < len(self.sections) else None
+
+    @property
+    def current_question(self):
+        section = self.current_section
+        if section is None or self.question_index >= len(self.paper[section]):
+            return None
+        return self.paper[section][self.question_index]
+
+    def time_left(self, now=None):
+        """Seconds left in the current section"""
+        if self.current_section is None:
+            return 0
+        elapsed = (now or time.time()) - self.section_started_at
+        return max(self.minutes[self.current_section] * 60 - elapsed, 0)
+
+    def _start_section(self, now=None):
+        self.question_index = 0
+        self.section_started_at = self.question_started_at = now or time.time()
+        if self.current_section is None:
+            self.finished = True
+
+    def answer(self, outcome, now=None):
+        """Record 'correct', 'incorrect' or 'skip' for the current question and move on"""
+        now = now or time.time()
+        if self.finished or self.check_time(now):
+            return
+        question = self.current_question
+        result = self.results[self.current_section]
+        if outcome == "skip":
+            result.skipped += 1
+        else:
+            correct = outcome == "correct"
+            if correct:
+                result.correct += 1
+            else:
+                result.incorrect += 1
+            self.buffer.add(question[0], correct, now - self.question_started_at,
+                            datetime.fromtimestamp(now))
+
+        self.question_index += 1
+        self.question_started_at = now
+        if self.current_question is None:
+            self.end_section(now)
+
+    def check_time(self, now=None):
+        """End the current section if its time is up; returns True when it did"""
+        if not self.finished and self.time_left(now) <= 0:
+            self.end_section(now)
+            return True
+        return False
+
+    def end_section(self, now=None):
+        """Close the current section; unanswered questions count as skipped"""
+        section = self.current_section
+        if section is None:
+            return
+        result = self.results[section]
+        result.skipped = result.total - result.correct - result.incorrect
+        self.section_index += 1
+        self._start_section(now)
+
+    def section_scores(self):
+        return {section: result.score for section, result in self.results.items()}
+
+
+def finish_test(test, date=None):
+    """
+    Write the remaining attempts and one progress row per section in a single transaction.
+
+    Sections still open are closed first, their unanswered questions skipped.
+
+    Returns the section -> score mapping that was saved.
+    """
+    date = date or datetime.now().strftime('%Y-%m-%d')
+    while not test.finished:
+        test.end_section()
+    scores = test.section_scores()
+    with transaction() as conn:
+        test.buffer.flush(conn)
+        conn.executemany("""
+            INSERT INTO progress (date, section, topic, subtopic, score)
+            VALUES (?, ?, ?, ?, ?)
+        """, [(date, section, section, MOCK_TEST_SUBTOPIC, score) for section, score in scores.items()])
+    return scores
@@ -0,0 +1,163 @@
+import json
+import math
+import random
+from datetime import datetime, timedelta
+
+from config import (CAT_SECTIONS, DIFFICULTY_LEVELS, PRACTICE_RECENT_DAYS, PRACTICE_SECONDS_PER_QUESTION,
+                    PRACTICE_SET_SIZE)
+
+MISSED_SHARE = 0.7     # chance a pick comes from questions not yet answered correctly
+MIN_BUCKET_WEIGHT = 0.1  # keeps strong buckets in rotation
+
+# Average score per (section, subtopic) over the recent window
+_SUBTOPIC_SCORES_SQL = """
+    SELECT section, subtopic, AVG(score)
+    FROM progress
+    WHERE section IN (SELECT value FROM json_each(?)) AND date >= ?
+    GROUP BY section, subtopic
+"""
+
+# Recent attempts and correct answers per (topic, difficulty), from the daily rollup
+_RECENT_ACCURACY_SQL = """
+    SELECT topic, difficulty, SUM(attempts), SUM(correct)
+    FROM question_accuracy_daily
+    WHERE topic IN (SELECT value FROM json_each(?)) AND date >= ?
+    GROUP BY topic, difficulty
+"""
+
+# First question at or after a random sample key in one (topic, difficulty, correct)
+# bucket; idx_questions_bucket_key ends in the key, so this is a single index seek
+_PROBE_SQL = """
+    SELECT id, rand_key FROM questions
+    WHERE topic = ? AND difficulty = ? AND correct = ? AND rand_key >= ?
+    ORDER BY rand_key
+    LIMIT 1
+"""
+
+_ROWS_SQL = """
+    SELECT id, date, question, answer, topic, difficulty, correct
+    FROM questions
+    WHERE id IN (SELECT value FROM json_each(?))
+"""
+
+
+def section_weakness(c, sections, since):
+    """
+    Section -> weakness in [0, 1], the mean of (100 - score) / 100 over its subtopics.
+
+    Every subtopic counts once however often it was scored, so one weak
+    subtopic is not drowned out by a well-practised one. Sections without
+    recent scores are treated as middling (0.5).
+    """
+    rows = c.execute(_SUBTOPIC_SCORES_SQL, (json.dumps(list(sections)), since)).fetchall()
+    per_section = {}
+    for section, subtopic, avg_score in rows:
+        if avg_score is not None:
+            per_section.setdefault(section, []).append(min(max((100 - avg_score) / 100, 0), 1))
+    return {section: sum(values) / len(values) for section, values in per_section.items()}
+
+
+def recent_error_rates(c, sections, since):
+    """(topic, difficulty) -> smoothed share of recent attempts answered incorrectly"""
+    rows = c.execute(_RECENT_ACCURACY_SQL, (json.dumps(list(sections)), since)).fetchall()
+    # Laplace smoothing: a bucket with no attempts sits at 0.5 rather than 0 or 1
+    return {(topic, difficulty): (attempts - correct + 1) / (attempts + 2)
+            for topic, difficulty, attempts, correct in rows}
+
+
+def bucket_weights(c, sections, difficulties, today=None):
+    """(topic, difficulty) -> sampling weight from section weakness and recent mistakes"""
+    today = today or datetime.now().date()
+    since = (today - timedelta(days=PRACTICE_RECENT_DAYS)).strftime('%Y-%m-%d')
+    weakness = section_weakness(c, sections, since)
+    errors = recent_error_rates(c, sections, since)
+    return {(topic, difficulty): MIN_BUCKET_WEIGHT + weakness.get(topic, 0.5) + errors.get((topic, difficulty), 0.5)
+            for topic in sections for difficulty in difficulties}
+
+
+def _probe(c, topic, difficulty, correct, start):
+    """(id, key) of the first question keyed >= start in a bucket, wrapping around to its lowest key"""
+    row = c.execute(_PROBE_SQL, (topic, difficulty, correct, start)).fetchone()
+    if row is None and start > 0:
+        row = c.execute(_PROBE_SQL, (topic, difficulty, correct, 0)).fetchone()
+    return row
+
+
+def _draw(c, topic, difficulty, correct, chosen, rng):
+    """
+    A random question id from a bucket that is not already in `chosen`, or None.
+
+    Seeks to a uniform random sample key, so every question in the bucket is
+    equally likely however its ids are laid out, then walks forward past
+    questions already picked; the walk is bounded by the size of the set
+    rather than the size of the bank.
+    """
+    first = row = _probe(c, topic, difficulty, correct, rng.random())
+    while row is not None and row[0] in chosen:
+        row = _probe(c, topic, difficulty, correct, math.nextafter(row[1], math.inf))
+        if row == first:
+            return None
+    return row[0] if row else None
+
+
+def draw_question(c, topic, difficulty, chosen, rng, missed_share=MISSED_SHARE):
+    """
+    A random question id for (topic, difficulty) that is not in `chosen`, or None if there is none.
+
+    Questions not yet answered correctly are tried first with probability
+    `missed_share`, falling back to the rest of the bucket.
+    """
+    order = (0, 1) if rng.random() < missed_share else (1, 0)
+    for correct in order:
+        question_id = _draw(c, topic, difficulty, correct, chosen, rng)
+        if question_id is not None:
+            return question_id
+    return None
+
+
+def build_practice_set(c, size=PRACTICE_SET_SIZE, time_budget_minutes=None, topic=None, difficulty=None,
+                       today=None, rng=None):
+    """
+    Pick up to `size` questions, leaning towards weak sections and recent mistakes.
+
+    Each pick draws a (topic, difficulty) bucket by weight, then a random
+    question from it with an index seek, preferring questions not yet answered
+    correctly. Only the chosen rows are ever read, so the cost grows with the
+    set size and not with the question bank. Questions that would take the
+    set past `time_budget_minutes` (estimated from PRACTICE_SECONDS_PER_QUESTION)
+    are left out. Rows match practice_questions_query: (id, date, question,
+    answer, topic, difficulty, correct).
+    """
+    rng = rng or random.Random()
+    sections = [topic] if topic and topic != "All" else CAT_SECTIONS
+    difficulties = [difficulty] if difficulty and difficulty != "All" else DIFFICULTY_LEVELS
+    weights = bucket_weights(c, sections, difficulties, today)
+    budget = time_budget_minutes * 60 if time_budget_minutes else None
+    chosen = []
+    seconds = 0
+
+    while len(chosen) < size and weights:
+        buckets = list(weights)
+        bucket = rng.choices(buckets, weights=[weights[b] for b in buckets])[0]
+        bucket_topic, bucket_difficulty = bucket
+        cost = PRACTICE_SECONDS_PER_QUESTION.get(bucket_difficulty, 120)
+        if budget is not None and seconds + cost > budget:
+            # Nothing more from this difficulty fits
+            del weights[bucket]
+            continue
+
+        question_id = draw_question(c, bucket_topic, bucket_difficulty, chosen, rng)
+        if question_id is None:
+            del weights[bucket]
+            continue
+
+        chosen.append(question_id)
+        seconds += cost
+
+    return fetch_questions(c, chosen)
+
+
+def fetch_questions(c, question_ids):
+    """Question rows for the given ids, in the order given; ids that no longer exist are skipped"""
+    rows = {row[0]: row for row in c.execute(_ROWS_SQL, (json.dumps(list(question_ids)),)).fetchall()}
+    return [rows[question_id] for question_id in question_ids if question_id in rows]
@@ -0,0 +1,162 @@
+import json
+import re
+
+
+class Query:
+    """
+    Builds a parameterized SELECT from a fixed base statement.
+
+    Conditions are always emitted in the order they are added and values only
+    ever travel as parameters, so every combination of filters maps to one
+    stable SQL string that sqlite's statement cache can reuse.
+    """
+
+    def __init__(self, select):
+        self.select = select
+        self.conditions = []
+        self.params = []
+        self.order = None
+        self.limit_rows = None
+
+    def where(self, condition, *params):
+        """AND a condition with ? placeholders onto the query"""
+        self.conditions.append(condition)
+        self.params.extend(params)
+        return self
+
+    def where_if(self, value, condition, *params):
+        """Add the condition only when a filter value was chosen (None or 'All' means no filter)"""
+        if value is None or value == "All" or value == "" or value == []:
+            return self
+        return self.where(condition, *params)
+
+    def order_by(self, clause):
+        self.order = clause
+        return self
+
+    def page(self, after_id, page_size, key="id"):
+        """Keyset pagination: the next page_size rows with key > after_id, in key order"""
+        return self.where(f"{key} > ?", after_id).order_by(key).limit(page_size)
+
+    def limit(self, rows):
+        self.limit_rows = rows
+        return self
+
+    def _filtered(self):
+        sql = self.select
+        if self.conditions:
+            sql += " WHERE " + " AND ".join(self.conditions)
+        return sql
+
+    def build_count(self):
+        """(sql, params) counting every row the filters match, ignoring order and limit"""
+        return f"SELECT COUNT(*) FROM ({self._filtered()})", tuple(self.params)
+
+    def build(self):
+        """Return (sql, params) ready for cursor.execute()"""
+        sql = self._filtered()
+        if self.order:
+            sql += " ORDER BY " + self.order
+        params = list(self.params)
+        if self.limit_rows is not None:
+            sql += " LIMIT ?"
+            params.append(int(self.limit_rows))
+        return sql, tuple(params)
+
+
+def split_tags(tags):
+    """Split a comma-separated tag string into unique, trimmed tags, keeping their order"""
+    seen = []
+    for tag in (tags or "").split(","):
+        tag = tag.strip()
+        if tag and tag.lower() not in (t.lower() for t in seen):
+            seen.append(tag)
+    return seen
+
+
+def due_flashcards_query(now, category=None, limit=None):
+    """The next cards due for review by `now` (a 'YYYY-MM-DD HH:MM:SS' string), most overdue first"""
+    return (Query("""SELECT id, word, definition, usage, category, ease, interval_days, repetitions, due_at
+                     FROM flashcards""")
+            .where("due_at <= ?", now)
+            .where_if(category, "category = ?", category)
+            .order_by("due_at")
+            .limit(limit))
+
+
+def flashcards_query(category=None):
+    """Every flashcard in a category, for browsing"""
+    return (Query("SELECT id, word, definition, usage, category, mastered, due_at FROM flashcards")
+            .where_if(category, "category = ?", category))
+
+
+def practice_questions_query(topic=None, difficulty=None):
+    """Questions for the practice page, filtered by topic and difficulty"""
+    return (Query("SELECT id, date, question, answer, topic, difficulty, correct FROM questions")
+            .where_if(topic, "topic = ?", topic)
+            .where_if(difficulty, "difficulty = ?", difficulty))
+
+
+def fts_match(term):
+    """
+    Turn free text into a safe FTS5 MATCH expression, or None if it has no words.
+
+    Each word is quoted (so FTS5 operators typed by the user are plain text)
+    and becomes a prefix query; all words must match.
+    """
+    words = re.findall(r"\w+", term or "")
+    return " ".join(f'"{word}"*' for word in words) or None
+
+
+# Search results join the FTS index for ranking and a highlighted snippet;
+# bm25() weights title, content and tags matches 10:1:5
+_NOTES_SEARCH_SELECT = """SELECT notes.date, notes.title, notes.content, notes.tags,
+       snippet(notes_fts, -1, '**', '**', ' … ', 16) AS snippet
+FROM notes_fts JOIN notes ON notes.id = notes_fts.rowid"""
+_NOTES_SEARCH_RANK = "bm25(notes_fts, 10.0, 1.0, 5.0)"
+
+_NOTES_SELECT = "SELECT notes.date, notes.title, notes.content, notes.tags, NULL AS snippet FROM notes"
+
+_HAS_TAG = """notes.id IN (SELECT note_rowid FROM note_tags WHERE tag = ?)"""
+_HAS_ANY_TAG = """notes.id IN (SELECT note_rowid FROM note_tags
+                                  WHERE tag IN (SELECT value FROM json_each(?)))"""
+
+
+def _notes_base(search_term):
+    """(query, is_search) for the notes table, joined to the FTS index when searching"""
+    match = fts_match(search_term)
+    if match:
+        return Query(_NOTES_SEARCH_SELECT).where("notes_fts MATCH ?", match), True
+    return Query(_NOTES_SELECT), False
+
+
+def notes_query(search_term=None, tags=None):
+    """
+    Notes matching a search term and any of the given tags.
+
+    Rows are (date, title, content, tags, snippet). Searches are ranked by
+    BM25 and carry a highlighted snippet; otherwise notes come newest first
+    and snippet is None. The tag list travels as one JSON parameter, so the
+    SQL text is the same however many tags are selected.
+    """
+    query, is_search = _notes_base(search_term)
+    query.where_if(tags, _HAS_ANY_TAG, json.dumps(list(tags or [])))
+    return query.order_by(_NOTES_SEARCH_RANK if is_search else "notes.date DESC")
+
+
+# Lecture view sort options -> ORDER BY clause
+LECTURE_SORT_ORDERS = {
+    "Date (Newest First)": "notes.date DESC",
+    "Date (Oldest First)": "notes.date ASC",
+    "Title (A-Z)": "notes.title ASC",
+}
+
+
+def lectures_query(search_term=None, topic=None, sort_order=None):
+    """Lecture notes (tagged 'lecture'), optionally searched and filtered by topic tag"""
+    query, is_search = _notes_base(search_term)
+    query.where(_HAS_TAG, "lecture")
+    query.where_if(topic, _HAS_TAG, topic)
+    if is_search:
+        return query.order_by(_NOTES_SEARCH_RANK)
+    return query.order_by(LECTURE_SORT_ORDERS.get(sort_order, "notes.date DESC"))
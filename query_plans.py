@@ -0,0 +1,241 @@
+import re
+import sqlite3
+import sys
+
+from migrations import migrate
+from dashboard import _COUNTERS_SQL, _LECTURE_PROGRESS_SQL, _SECTION_SCORES_SQL
+from lecture_catalog import _WATCHED_SQL
+from practice import _PROBE_SQL, _RECENT_ACCURACY_SQL, _ROWS_SQL, _SUBTOPIC_SCORES_SQL
+from spaced_repetition import _CARD_STATE_SQL, _CATEGORY_DUE_COUNT_SQL, _DUE_COUNT_SQL, _RESCHEDULE_SQL
+from timer_engine import _LATEST_SESSION_SQL, _RECENT_SESSIONS_SQL, _SESSION_EVENTS_SQL, _TODAY_MINUTES_SQL
+from queries import due_flashcards_query, flashcards_query, practice_questions_query, notes_query, lectures_query
+from utils import _SECTION_AVERAGE_SQL, _SET_WATCHED_SQL
+
+# Filtered queries run on every render, with representative parameters, taken
+# from the modules that run them. Each one must be answered through an index,
+# never by scanning the table.
+HOT_QUERIES = [
+    ("Sidebar/dashboard today's study time",
+     _TODAY_MINUTES_SQL,
+     ("2024-01-01",)),
+    ("Focus timer latest journaled session",
+     _LATEST_SESSION_SQL,
+     ()),
+    ("Focus timer session journal replay",
+     _SESSION_EVENTS_SQL,
+     ("0f8fad5bd9cb469fa16570867728950e",)),
+    ("Section average score",
+     _SECTION_AVERAGE_SQL,
+     ("VARC",)),
+    ("Adaptive practice subtopic weakness",
+     _SUBTOPIC_SCORES_SQL,
+     ('["VARC", "DILR", "Quant"]', "2024-01-01")),
+    ("Adaptive practice recent accuracy",
+     _RECENT_ACCURACY_SQL,
+     ('["VARC", "DILR", "Quant"]', "2024-01-01")),
+    ("Adaptive practice question draw",
+     _PROBE_SQL,
+     ("VARC", "Hard", 0, 0.5)),
+    ("Adaptive practice question rows",
+     _ROWS_SQL,
+     ("[1, 2, 3]",)),
+    ("Practice questions page filtered by topic and difficulty",
+     *practice_questions_query("VARC", "Easy").page(100, 25).build()),
+    ("Practice questions page filtered by topic",
+     *practice_questions_query("VARC").page(100, 25).build()),
+    ("Practice questions page filtered by difficulty",
+     *practice_questions_query(difficulty="Hard").page(100, 25).build()),
+    ("Practice questions filtered count",
+     *practice_questions_query("VARC", "Easy").build_count()),
+    ("Flashcards page filtered by category",
+     *flashcards_query("VARC").page(100, 25).build()),
+    ("Flashcard review due queue",
+     *due_flashcards_query("2024-01-01 09:00:00", limit=1).build()),
+    ("Flashcard review due queue for a category",
+     *due_flashcards_query("2024-01-01 09:00:00", "VARC", 1).build()),
+    ("Flashcard review due count",
+     _DUE_COUNT_SQL,
+     ("2024-01-01 09:00:00",)),
+    ("Flashcard review due count for a category",
+     _CATEGORY_DUE_COUNT_SQL,
+     ("VARC", "2024-01-01 09:00:00")),
+    ("Flashcard review card state",
+     _CARD_STATE_SQL,
+     (42,)),
+    ("Flashcard review reschedule",
+     _RESCHEDULE_SQL,
+     (2.5, 6, 2, "2024-01-07 09:00:00", 0, 42)),
+    ("Notes filtered by tag",
+     *notes_query(tags=["VARC", "Tips"]).build()),
+    ("Notes full-text search",
+     *notes_query("reading comp", ["VARC"]).build()),
+    ("Lectures filtered by topic",
+     *lectures_query(topic="Quant", sort_order="Title (A-Z)").build()),
+    ("Lecture catalog watched status",
+     _WATCHED_SQL,
+     ()),
+    ("Bulk lecture watched update",
+     _SET_WATCHED_SQL,
+     (1, '["Speed Math (SM 1)", "Averages (AVG 1)"]', 1)),
+]
+
+# Queries that walk an index in order and stop after a LIMIT, with no filter to
+# search on. Only these may scan, and only through an index.
+INDEX_WALKS = [
+    ("Focus timer recent sessions",
+     _RECENT_SESSIONS_SQL,
+     (5,)),
+]
+
+# Whole-table aggregates read every row by design. They may scan a rollup table,
+# which holds one row per day and bucket, or read an index in place of the table.
+AGGREGATES = [
+    ("Dashboard headline counters",
+     _COUNTERS_SQL,
+     {"today": "2024-01-01", "yesterday": "2023-12-31"}),
+    ("Dashboard section scores",
+     _SECTION_SCORES_SQL,
+     ()),
+    ("Dashboard lecture progress",
+     _LECTURE_PROGRESS_SQL,
+     ()),
+]
+
+# The pages below write their SQL inline and cannot be imported without running
+# them, so these are copies; test_query_plans fails when one no longer appears
+# word for word in its page.
+PAGES = ("app.py", "minimal_timer_with_analysis.py")
+
+PAGE_QUERIES = [
+    ("Progress Trends daily study time",
+     """SELECT date, SUM(total_minutes) as daily_time
+        FROM daily_study_rollup
+        WHERE date BETWEEN ? AND ?
+        GROUP BY date
+        ORDER BY date""",
+     ("2024-01-01", "2024-01-31")),
+    ("Study Patterns daily totals",
+     """SELECT date, topic, subtopic, total_minutes
+        FROM daily_study_rollup
+        WHERE date BETWEEN ? AND ?
+        ORDER BY date""",
+     ("2024-01-01", "2024-01-31")),
+    ("Focus timer analysis by date and topic",
+     """SELECT date, topic, SUM(total_minutes) as total_time, SUM(session_count) as sessions
+        FROM daily_study_rollup
+        WHERE date BETWEEN ? AND ?
+        GROUP BY date, topic
+        ORDER BY date""",
+     ("2024-01-01", "2024-01-31")),
+    ("Topic Analysis time per subtopic",
+     """SELECT subtopic, AVG(time_spent) as avg_time
+        FROM study_log
+        WHERE topic = ?
+        GROUP BY subtopic""",
+     ("VARC",)),
+    ("Topic Analysis total time",
+     "SELECT SUM(time_spent) as total_time FROM study_log WHERE topic = ?",
+     ("VARC",)),
+    ("Progress Trends section averages",
+     """SELECT date, section, AVG(score) as avg_score
+        FROM progress
+        WHERE date BETWEEN ? AND ?
+        GROUP BY date, section
+        ORDER BY date""",
+     ("2024-01-01", "2024-01-31")),
+    ("Topic Analysis subtopic scores",
+     """SELECT subtopic, AVG(score) as avg_score, COUNT(*) as attempts
+        FROM progress
+        WHERE topic = ?
+        GROUP BY subtopic
+        ORDER BY avg_score DESC""",
+     ("VARC",)),
+    ("Topic Analysis success rate by difficulty",
+     """SELECT difficulty, SUM(attempts) as count, 100.0 * SUM(correct) / SUM(attempts) as success_rate
+        FROM question_accuracy_daily
+        WHERE topic = ?
+        GROUP BY difficulty""",
+     ("VARC",)),
+    ("Topic Analysis accuracy over time",
+     """SELECT date, difficulty, 100.0 * SUM(correct) / SUM(attempts) as success_rate
+        FROM question_accuracy_daily
+        WHERE topic = ?
+        GROUP BY date, difficulty
+        ORDER BY date""",
+     ("VARC",)),
+    ("Lectures by category",
+     """SELECT title, url, notes, rating, rowid, watched
+        FROM videos
+        WHERE category = ?
+        ORDER BY title ASC""",
+     ("VARC",)),
+]
+
+PAGE_AGGREGATES = [
+    ("Flashcards page mastered count",
+     "SELECT COUNT(*) FROM flashcards WHERE mastered = 1",
+     ()),
+    ("Practice questions page correct count",
+     "SELECT COUNT(*) FROM questions WHERE correct = 1",
+     ()),
+    ("Dashboard flashcard mastery by category",
+     """SELECT category,
+                       COUNT(*) as total,
+                       SUM(CASE WHEN mastered = 1 THEN 1 ELSE 0 END) as mastered
+                FROM flashcards
+                GROUP BY category""",
+     ()),
+]
+
+_SCAN = re.compile(r"^SCAN (\w+)")
+_LIMIT = re.compile(r"\bLIMIT\s+\?", re.IGNORECASE)
+
+_ROLLUP_TABLES = {"daily_study_rollup", "question_accuracy_daily"}
+
+
+def _scans(conn, queries, allowed=None):
+    """(description, plan line) for each step of `queries` that scans a table, unless allowed(sql, table, detail)"""
+    scans = []
+    for description, sql, params in queries:
+        for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params):
+            detail = row[3]
+            match = _SCAN.match(detail)
+            # Table-valued functions such as json_each are scanned by design
+            if not match or match.group(1) == "CONSTANT" or "VIRTUAL TABLE" in detail:
+                continue
+            if allowed is None or not allowed(sql, match.group(1), detail):
+                scans.append((description, detail))
+    return scans
+
+
+def _walked(sql, table, detail):
+    return _LIMIT.search(sql) is not None and " USING INDEX " in detail
+
+
+def _aggregated(sql, table, detail):
+    return table in _ROLLUP_TABLES or " INDEX " in detail
+
+
+def find_table_scans(conn):
+    """
+    Run EXPLAIN QUERY PLAN over every checked query.
+
+    Returns (description, plan line) pairs for every query step that scans a
+    table instead of searching an index. An empty list means every plan is clean.
+    """
+    return (_scans(conn, HOT_QUERIES + PAGE_QUERIES)
+            + _scans(conn, INDEX_WALKS, _walked)
+            + _scans(conn, AGGREGATES + PAGE_AGGREGATES, _aggregated))
+
+
+if __name__ == "__main__":
+    # Check against a throwaway in-memory copy of the current schema
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+
+    scans = find_table_scans(conn)
+    for description, detail in scans:
+        print(f"SCAN  {description}: {detail}")
+    checked = len(HOT_QUERIES + PAGE_QUERIES + INDEX_WALKS + AGGREGATES + PAGE_AGGREGATES)
+    print(f"{checked - len({d for d, _ in scans})}/{checked} queries use an index")
+    sys.exit(1 if scans else 0)
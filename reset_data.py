@@ -2,6 +2,8 @@ import sqlite3
 import os
 import shutil
 
+from migrations import reset_schema
+
 def reset_database():
     # Check if database file exists
     if os.path.exists('cat_prep.db'):
@@ -9,6 +11,11 @@ def reset_database():
         try:
             os.remove('cat_prep.db')
             print("Database file deleted successfully!")
+
+            # Remove the write-ahead log files left behind by WAL mode
+            for suffix in ('-wal', '-shm'):
+                if os.path.exists('cat_prep.db' + suffix):
+                    os.remove('cat_prep.db' + suffix)
         except Exception as e:
             print(f"Error deleting database file: {e}")
 
@@ -16,18 +23,10 @@ def reset_database():
             try:
                 # Connect to the database
                 conn = sqlite3.connect('cat_prep.db')
-                c = conn.cursor()
-
-                # Get all table names
-                c.execute("SELECT name FROM sqlite_master WHERE type='table';")
-                tables = c.fetchall()
-
-                # Drop all tables
-                for table in tables:
-                    table_name = table[0]
-                    c.execute(f"DROP TABLE IF EXISTS {table_name}")
 
-                conn.commit()
+                # Drop all tables and rewind the schema version, so the app
+                # rebuilds the schema on its next start
+                reset_schema(conn)
                 conn.close()
 
                 print("All tables dropped successfully!")
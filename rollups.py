@@ -0,0 +1,149 @@
+import argparse
+from datetime import datetime, timedelta
+
+from db import transaction
+from queries import split_tags
+
+
+def rebuild_daily_rollup(c):
+    """
+    Recompute daily_study_rollup from the raw study_log rows.
+
+    The triggers on study_log keep the rollup current; this is only needed after
+    editing the database by hand or restoring a backup with the triggers missing.
+    Accepts a connection or cursor and runs inside the caller's transaction.
+    """
+    c.execute("DELETE FROM daily_study_rollup")
+    c.execute("""
+        INSERT INTO daily_study_rollup (date, topic, subtopic, total_minutes, session_count)
+        SELECT COALESCE(date, ''), COALESCE(topic, ''), COALESCE(subtopic, ''),
+               COALESCE(SUM(time_spent), 0), COUNT(*)
+        FROM study_log
+        GROUP BY COALESCE(date, ''), COALESCE(topic, ''), COALESCE(subtopic, '')
+    """)
+
+
+def record_study_day(c, day):
+    """
+    Fold one study day into the persisted streak in O(1).
+
+    Call after logging a session for `day` (a 'YYYY-MM-DD' string) in the same
+    transaction. Days at or after the last study date are applied
+    incrementally; a backdated day can split or join earlier runs, so it falls
+    back to a full rebuild.
+    """
+    row = c.execute("SELECT current_streak, longest_streak, last_study_date FROM study_streak WHERE id = 1").fetchone()
+    current, longest, last_day = row if row else (0, 0, None)
+
+    if last_day is not None and day <= last_day:
+        if day < last_day:
+            rebuild_study_streak(c)
+        return
+
+    previous_day = (datetime.strptime(day, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+    current = current + 1 if last_day == previous_day else 1
+    longest = max(longest, current)
+
+    c.execute("""
+        INSERT INTO study_streak (id, current_streak, longest_streak, last_study_date)
+        VALUES (1, ?, ?, ?)
+        ON CONFLICT (id) DO UPDATE
+        SET current_streak = excluded.current_streak,
+            longest_streak = excluded.longest_streak,
+            last_study_date = excluded.last_study_date
+    """, (current, longest, day))
+
+
+def streak_as_of(current_streak, last_study_date, today=None):
+    """The stored streak as seen on `today`: it lapses once a whole day has been missed"""
+    if not last_study_date:
+        return 0
+    today = today or datetime.now().date()
+    last_day = datetime.strptime(last_study_date, '%Y-%m-%d').date()
+    return current_streak if last_day >= today - timedelta(days=1) else 0
+
+
+def rebuild_study_streak(c):
+    """
+    Recompute the persisted streak from every study day in daily_study_rollup.
+
+    Consecutive days share the same (julianday - row number), so each group is
+    one unbroken run; the run ending on the latest day is the current streak.
+    """
+    runs = c.execute("""
+        WITH days AS (
+            SELECT DISTINCT date FROM daily_study_rollup WHERE julianday(date) IS NOT NULL
+        ),
+        runs AS (
+            SELECT date, julianday(date) - ROW_NUMBER() OVER (ORDER BY date) AS run
+            FROM days
+        )
+        SELECT COUNT(*) AS length, MAX(date) AS last_day
+        FROM runs
+        GROUP BY run
+        ORDER BY last_day
+    """).fetchall()
+
+    c.execute("DELETE FROM study_streak")
+    if runs:
+        current, last_day = runs[-1]
+        longest = max(length for length, _ in runs)
+        c.execute("""
+            INSERT INTO study_streak (id, current_streak, longest_streak, last_study_date)
+            VALUES (1, ?, ?, ?)
+        """, (current, longest, last_day))
+
+
+def rebuild_question_accuracy(c):
+    """Recompute question_accuracy_daily from question_attempts joined to each question's topic and difficulty"""
+    c.execute("DELETE FROM question_accuracy_daily")
+    c.execute("""
+        INSERT INTO question_accuracy_daily (topic, difficulty, date, attempts, correct, total_seconds)
+        SELECT COALESCE(q.topic, ''), COALESCE(q.difficulty, ''), date(a.attempted_at),
+               COUNT(*), SUM(a.correct), COALESCE(SUM(a.time_taken_seconds), 0)
+        FROM question_attempts a JOIN questions q ON q.id = a.question_id
+        GROUP BY COALESCE(q.topic, ''), COALESCE(q.difficulty, ''), date(a.attempted_at)
+    """)
+
+
+def sync_note_tags(c, note_id, tags):
+    """Replace a note's rows in note_tags with the tags in its comma-separated string"""
+    c.execute("DELETE FROM note_tags WHERE note_rowid = ?", (note_id,))
+    c.executemany("INSERT INTO note_tags (tag, note_rowid) VALUES (?, ?)",
+                  [(tag, note_id) for tag in split_tags(tags)])
+
+
+def rebuild_note_tags(c):
+    """Recompute note_tags from the tags column of every note"""
+    c.execute("DELETE FROM note_tags")
+    notes = c.execute("SELECT rowid, tags FROM notes WHERE tags IS NOT NULL AND tags != ''").fetchall()
+    c.executemany("INSERT INTO note_tags (tag, note_rowid) VALUES (?, ?)",
+                  [(tag, note_id) for note_id, tags in notes for tag in split_tags(tags)])
+
+
+def rebuild_notes_fts(c):
+    """Re-index every note in the notes_fts full-text index"""
+    c.execute("INSERT INTO notes_fts (notes_fts) VALUES ('rebuild')")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Maintain the CAT Prep Tracker summary tables")
+    parser.add_argument("command", choices=["rebuild"],
+                        help="recompute every derived table (rollups, streak, note tags, FTS index)")
+    args = parser.parse_args()
+
+    with transaction() as conn:
+        c = conn.cursor()
+        rebuild_daily_rollup(c)
+        rebuild_study_streak(c)
+        rebuild_note_tags(c)
+        rebuild_notes_fts(c)
+        rebuild_question_accuracy(c)
+        days = c.execute("SELECT COUNT(DISTINCT date) FROM daily_study_rollup").fetchone()[0]
+        streak = c.execute("SELECT current_streak, longest_streak FROM study_streak").fetchone() or (0, 0)
+        tags = c.execute("SELECT COUNT(DISTINCT tag) FROM note_tags").fetchone()[0]
+    print(f"Rebuilt daily_study_rollup: {days} days")
+    print(f"Rebuilt study_streak: current {streak[0]}, longest {streak[1]}")
+    print(f"Rebuilt note_tags: {tags} distinct tags")
+    print("Rebuilt notes_fts")
+    print("Rebuilt question_accuracy_daily")
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from config import FLASHCARD_MASTERED_DAYS
+from queries import due_flashcards_query
+
+# Review buttons -> SM-2 quality grade (0-5)
+GRADES = {
+    "Again": 1,
+    "Hard": 3,
+    "Good": 4,
+    "Easy": 5,
+}
+
+MIN_EASE = 1.3
+RELEARN_MINUTES = 10  # a failed card comes back later in the same session
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_DUE_COUNT_SQL = "SELECT COUNT(*) FROM flashcards WHERE due_at <= ?"
+
+_CATEGORY_DUE_COUNT_SQL = "SELECT COUNT(*) FROM flashcards WHERE category = ? AND due_at <= ?"
+
+_CARD_STATE_SQL = "SELECT ease, interval_days, repetitions FROM flashcards WHERE id = ?"
+
+_RESCHEDULE_SQL = """
+    UPDATE flashcards
+    SET ease = ?, interval_days = ?, repetitions = ?, due_at = ?, mastered = ?
+    WHERE id = ?
+"""
+
+
+def schedule(ease, interval_days, repetitions, grade, now=None):
+    """
+    Apply one SM-2 review to a card's state.
+
+    Returns (ease, interval_days, repetitions, due_at) where due_at is a
+    datetime. A grade below 3 resets the card to relearning.
+    """
+    now = now or datetime.now()
+    ease = max(MIN_EASE, ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+
+    if grade < 3:
+        return ease, 0, 0, now + timedelta(minutes=RELEARN_MINUTES)
+
+    repetitions += 1
+    if repetitions == 1:
+        interval_days = 1
+    elif repetitions == 2:
+        interval_days = 6
+    else:
+        interval_days = max(interval_days + 1, round(interval_days * ease))
+    return ease, interval_days, repetitions, now + timedelta(days=interval_days)
+
+
+def due_cards(c, category=None, limit=1, now=None):
+    """
+    The next `limit` cards due for review, most overdue first.
+
+    Served from the due_at index, so the cost depends on `limit` and
+    not on how many cards are in the deck.
+    """
+    now = (now or datetime.now()).strftime(TIMESTAMP_FORMAT)
+    return c.execute(*due_flashcards_query(now, category, limit).build()).fetchall()
+
+
+def due_count(c, category=None, now=None):
+    """How many cards are due right now"""
+    now = (now or datetime.now()).strftime(TIMESTAMP_FORMAT)
+    if category and category != "All":
+        return c.execute(_CATEGORY_DUE_COUNT_SQL, (category, now)).fetchone()[0]
+    return c.execute(_DUE_COUNT_SQL, (now,)).fetchone()[0]
+
+
+def record_review(c, card_id, grade, now=None):
+    """
+    Grade a card: reschedule it and append the review to flashcard_reviews.
+
+    Run inside a transaction; the card counts as mastered once its interval
+    reaches FLASHCARD_MASTERED_DAYS. Returns the new due_at datetime, or None
+    if the card no longer exists.
+    """
+    now = now or datetime.now()
+    row = c.execute(_CARD_STATE_SQL, (card_id,)).fetchone()
+    if row is None:
+        return None
+
+    ease, interval_days, repetitions, due_at = schedule(*row, grade, now)
+    due_at_text = due_at.strftime(TIMESTAMP_FORMAT)
+    c.execute(_RESCHEDULE_SQL, (ease, interval_days, repetitions, due_at_text,
+                                int(interval_days >= FLASHCARD_MASTERED_DAYS), card_id))
+    c.execute("""
+        INSERT INTO flashcard_reviews (card_rowid, reviewed_at, grade, ease, interval_days, due_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (card_id, now.strftime(TIMESTAMP_FORMAT), grade, ease, interval_days, due_at_text))
+    return due_at
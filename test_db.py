@@ -0,0 +1,12 @@
+from db import connect
+
+
+def test_closing_a_connection_twice_returns_it_to_the_pool_once(fresh_db):
+    conn = connect()
+    conn.close()
+    conn.close()
+
+    first, second = connect(), connect()
+    assert first is not second
+    first.close()
+    second.close()
@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+
+from config import FLASHCARD_MASTERED_DAYS
+from db import connect, transaction
+from spaced_repetition import GRADES, due_count, record_review
+from utils import save_flashcards_bulk
+
+
+def _card(word):
+    conn = connect()
+    row = conn.execute("SELECT id, mastered, interval_days, repetitions, due_at FROM flashcards WHERE word = ?",
+                       (word,)).fetchone()
+    conn.close()
+    return row
+
+
+def test_imported_mastered_card_stays_mastered_after_a_review(fresh_db):
+    save_flashcards_bulk([("known", "def", "", "VARC", 1, "2026-01-05"),
+                          ("new", "def", "", "VARC", 0, "2026-01-05")])
+
+    card_id, mastered, interval_days, repetitions, due_at = _card("known")
+    assert (mastered, interval_days, repetitions) == (1, FLASHCARD_MASTERED_DAYS, 3)
+    assert due_at > (datetime.now() + timedelta(days=FLASHCARD_MASTERED_DAYS - 1)).strftime('%Y-%m-%d %H:%M:%S')
+
+    # Only the card that is not mastered is due now
+    conn = connect()
+    assert due_count(conn.cursor()) == 1
+    conn.close()
+    assert _card("new")[1:4] == (0, 0, 0)
+
+    with transaction() as conn:
+        record_review(conn.cursor(), card_id, GRADES["Good"])
+    assert _card("known")[1] == 1
@@ -0,0 +1,103 @@
+import random
+
+from config import CAT_SECTIONS, DIFFICULTY_LEVELS
+from db import connect
+from mock_test import MockTest, assemble_paper, finish_test, section_score
+from utils import save_questions_bulk
+
+SECTIONS = {"VARC": (6, 40), "DILR": (4, 30)}
+
+
+def _import_sorted_bank(per_bucket=50):
+    save_questions_bulk([(f"Q{topic}{difficulty}{n}", "A", topic, difficulty, "2026-01-05", 0)
+                         for topic in CAT_SECTIONS for difficulty in DIFFICULTY_LEVELS
+                         for n in range(per_bucket)])
+
+
+def _start(sections=SECTIONS, now=1000):
+    conn = connect()
+    test = MockTest.start(conn.cursor(), sections, now=now, rng=random.Random(1))
+    conn.close()
+    return test
+
+
+def test_paper_has_each_section_in_an_even_difficulty_mix(fresh_db):
+    _import_sorted_bank()
+    conn = connect()
+    paper = assemble_paper(conn.cursor(), SECTIONS, random.Random(1))
+    conn.close()
+
+    assert list(paper) == ["VARC", "DILR"]
+    for section, (count, _minutes) in SECTIONS.items():
+        rows = paper[section]
+        assert len({row[0] for row in rows}) == len(rows) == count
+        assert {row[4] for row in rows} == {section}
+        assert [row[5] for row in rows[:3]] == DIFFICULTY_LEVELS
+
+
+def test_papers_from_different_seeds_differ(fresh_db):
+    _import_sorted_bank()
+    conn = connect()
+    first, second = (assemble_paper(conn.cursor(), {"VARC": (24, 40)}, random.Random(seed)) for seed in (1, 2))
+    conn.close()
+
+    first_ids, second_ids = {row[0] for row in first["VARC"]}, {row[0] for row in second["VARC"]}
+    # 24 of 150 questions each: a handful in common, not the same paper
+    assert len(first_ids & second_ids) < 15
+
+
+def test_short_bank_gives_a_short_section(fresh_db):
+    save_questions_bulk([("Q", "A", "DILR", "Easy", "2026-01-05", 0)])
+    conn = connect()
+    paper = assemble_paper(conn.cursor(), SECTIONS, random.Random(1))
+    conn.close()
+
+    assert paper["VARC"] == []
+    assert len(paper["DILR"]) == 1
+
+
+def test_section_score_uses_cat_marking():
+    assert section_score(0, 0, 0) == 0.0
+    assert section_score(10, 0, 10) == 100.0
+    assert section_score(5, 5, 10) == 33.3
+    assert section_score(1, 5, 10) == 0.0
+
+
+def test_section_closes_when_its_time_runs_out(fresh_db):
+    _import_sorted_bank()
+    test = _start()
+    assert test.current_section == "VARC"
+    assert test.time_left(now=1000 + 600) == 40 * 60 - 600
+
+    test.answer("correct", now=1010)
+    test.answer("incorrect", now=1020)
+    # Too late: the answer is not counted and the section closes as of now
+    test.answer("correct", now=1000 + 40 * 60)
+    varc = test.results["VARC"]
+    assert (varc.correct, varc.incorrect, varc.skipped) == (1, 1, 4)
+    assert varc.score == section_score(1, 1, 6)
+
+    # The next section gets its own clock from when the last one closed
+    assert test.current_section == "DILR"
+    assert test.time_left(now=1000 + 40 * 60) == 30 * 60
+    assert not test.check_time(now=1000 + 40 * 60 + 30 * 60 - 1)
+    assert test.check_time(now=1000 + 40 * 60 + 30 * 60)
+    assert test.finished
+    assert test.results["DILR"].skipped == 4
+
+
+def test_finish_test_saves_attempts_and_section_scores(fresh_db):
+    _import_sorted_bank()
+    test = _start()
+    test.answer("correct", now=1010)
+    test.answer("skip", now=1020)
+
+    scores = finish_test(test, date="2026-01-05")
+    conn = connect()
+    attempts = conn.execute("SELECT COUNT(*) FROM question_attempts").fetchone()[0]
+    progress = conn.execute("SELECT section, score FROM progress ORDER BY section").fetchall()
+    conn.close()
+
+    assert attempts == 1
+    assert scores == {"VARC": section_score(1, 0, 6), "DILR": 0.0}
+    assert progress == [("DILR", 0.0), ("VARC", section_score(1, 0, 6))]
@@ -0,0 +1,44 @@
+import random
+from collections import Counter
+
+from config import CAT_SECTIONS, DIFFICULTY_LEVELS
+from db import connect
+from practice import build_practice_set, draw_question
+from utils import save_questions_bulk
+
+PER_BUCKET = 100
+
+
+def _import_sorted_bank():
+    # Sorted by bucket, as a sorted CSV would be: each bucket's ids are one block
+    save_questions_bulk([(f"Q{topic}{difficulty}{n}", "A", topic, difficulty, "2026-01-05", 0)
+                         for topic in CAT_SECTIONS for difficulty in DIFFICULTY_LEVELS
+                         for n in range(PER_BUCKET)])
+
+
+def test_practice_sets_spread_over_a_contiguous_bank(fresh_db):
+    _import_sorted_bank()
+    rng = random.Random(7)
+    conn = connect()
+    sets = [[row[0] for row in build_practice_set(conn.cursor(), 10, rng=rng)] for _ in range(50)]
+    conn.close()
+
+    appearances = Counter(question_id for ids in sets for question_id in ids)
+    assert all(len(set(ids)) == len(ids) == 10 for ids in sets)
+    # 500 picks from 900 questions reach well over 300 of them. A block-biased draw
+    # reaches under 100, with each bucket's lowest id in most of the sets
+    assert len(appearances) > 250
+    assert max(appearances.values()) <= 15
+
+
+def test_draws_do_not_favour_a_bucket_s_lowest_id(fresh_db):
+    _import_sorted_bank()
+    rng = random.Random(7)
+    conn = connect()
+    c = conn.cursor()
+    first_id = c.execute("SELECT MIN(id) FROM questions WHERE topic = 'DILR' AND difficulty = 'Hard'").fetchone()[0]
+    draws = Counter(draw_question(c, "DILR", "Hard", [], rng) for _ in range(2000))
+    conn.close()
+
+    assert len(draws) > 75
+    assert draws[first_id] < 200  # about 20 expected; a block-biased draw returns it almost every time
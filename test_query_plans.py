@@ -0,0 +1,25 @@
+import os
+import re
+import sqlite3
+
+import pytest
+
+from migrations import migrate
+from query_plans import PAGE_AGGREGATES, PAGE_QUERIES, PAGES, find_table_scans
+
+
+def _squash(sql):
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def test_hot_queries_use_an_index():
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    assert find_table_scans(conn) == []
+
+
+@pytest.mark.parametrize("description, sql, params", PAGE_QUERIES + PAGE_AGGREGATES)
+def test_page_query_copies_match_the_pages(description, sql, params):
+    here = os.path.dirname(os.path.abspath(__file__))
+    pages = [_squash(open(os.path.join(here, page), encoding="utf-8").read()) for page in PAGES]
+    assert any(_squash(sql) in page for page in pages), f"{description} no longer appears in {', '.join(PAGES)}"
@@ -0,0 +1,46 @@
+from db import connect
+from migrations import migrate
+from utils import record_question_attempt, save_questions_bulk
+
+
+def _attempts():
+    conn = connect()
+    rows = conn.execute("SELECT question_id, correct FROM question_attempts ORDER BY id").fetchall()
+    conn.close()
+    return rows
+
+
+def _accuracy():
+    conn = connect()
+    rows = conn.execute("SELECT topic, attempts, correct FROM question_accuracy_daily ORDER BY topic").fetchall()
+    conn.close()
+    return rows
+
+
+def test_bulk_import_logs_an_attempt_only_for_correct_questions(fresh_db):
+    save_questions_bulk([
+        ("Q1", "A1", "Quant", "Easy", "2026-01-05", 1),
+        ("Q2", "A2", "VARC", "Easy", "2026-01-05", 0),
+        ("Q3", "A3", "Quant", "Easy", "2026-01-06", 1),
+    ], chunk_size=2)
+
+    assert _attempts() == [(1, 1), (3, 1)]
+    assert _accuracy() == [("Quant", 1, 1), ("Quant", 1, 1)]
+
+    record_question_attempt(2, False)
+    assert _attempts()[-1] == (2, 0)
+
+
+def test_backfill_does_not_count_unattempted_questions_as_wrong(empty_db):
+    conn = connect()
+    conn.execute('''CREATE TABLE questions
+                    (id INTEGER PRIMARY KEY, date TEXT, question TEXT, answer TEXT, topic TEXT,
+                     difficulty TEXT, correct INTEGER)''')
+    conn.executemany("INSERT INTO questions (date, question, answer, topic, difficulty, correct) VALUES (?, ?, ?, ?, ?, ?)",
+                     [("2026-01-05", "Q1", "A1", "Quant", "Easy", 1), ("2026-01-05", "Q2", "A2", "VARC", "Easy", 0)])
+    conn.commit()
+    conn.close()
+
+    migrate()
+    assert _attempts() == [(1, 1)]
+    assert _accuracy() == [("Quant", 1, 1)]
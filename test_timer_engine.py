@@ -0,0 +1,31 @@
+import pytest
+
+from db import connect
+from timer_engine import COMPLETED, FocusTimer, advance
+
+
+def _count(table):
+    conn = connect()
+    count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    conn.close()
+    return count
+
+
+def test_failed_save_is_retried_and_written_once(fresh_db):
+    timer = FocusTimer(duration_seconds=1500)
+    advance(timer, "start", now=1000)
+    advance(timer, "finish", now=2500)
+    assert timer.state == COMPLETED
+
+    # No topic: record_focus_session rejects the row
+    with pytest.raises(ValueError, match="topic is required"):
+        timer.save()
+    assert not timer.saved
+    assert _count("study_log") == 0
+
+    timer.topic = "VARC"
+    assert timer.save() == 25
+    assert timer.saved
+    assert timer.save() == 0
+    assert _count("study_log") == 1
+    assert _count("timer_logs") == 1
@@ -0,0 +1,347 @@
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+
+from config import DEFAULT_BREAK_DURATION, DEFAULT_DAILY_GOAL, DEFAULT_FOCUS_DURATION, DEFAULT_REMINDER_TIME
+from db import connect, transaction, write_generation
+from utils import record_focus_session
+
+# What a focus session can be logged against
+TIMER_TOPICS = ["VARC", "DILR", "Quant", "General Preparation", "Mock Test", "Other"]
+
+# Phases; a long break runs LONG_BREAK_MULTIPLIER short breaks
+FOCUS = "Focus"
+SHORT_BREAK = "Short Break"
+LONG_BREAK = "Long Break"
+PHASES = [FOCUS, SHORT_BREAK, LONG_BREAK]
+LONG_BREAK_MULTIPLIER = 3
+
+# States
+IDLE = "idle"
+RUNNING = "running"
+PAUSED = "paused"
+COMPLETED = "completed"
+
+# Action -> states it may be taken from
+_TRANSITIONS = {
+    "start": (IDLE, PAUSED),
+    "pause": (RUNNING,),
+    "finish": (RUNNING, PAUSED),
+    "set_phase": (IDLE, COMPLETED),
+}
+
+_SETTINGS_USER = "default"
+
+_SETTINGS_SQL = """
+    SELECT focus_duration, break_duration, reminder_frequency, notification_enabled, daily_goal, reminder_time
+    FROM productivity_settings
+    WHERE user_id = ?
+"""
+
+_RECENT_SESSIONS_SQL = """
+    SELECT date, topic, time_spent
+    FROM study_log
+    ORDER BY date DESC, id DESC
+    LIMIT ?
+"""
+
+_TODAY_MINUTES_SQL = "SELECT SUM(total_minutes) FROM daily_study_rollup WHERE date = ?"
+
+_JOURNAL_SQL = """
+    INSERT INTO timer_events (session_id, event, at, phase, duration_seconds, topic, subtopic)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_LATEST_SESSION_SQL = "SELECT session_id FROM timer_events WHERE id = (SELECT MAX(id) FROM timer_events)"
+
+_SESSION_EVENTS_SQL = """
+    SELECT event, at, phase, duration_seconds, topic, subtopic
+    FROM timer_events
+    WHERE session_id = ?
+    ORDER BY id
+"""
+
+# Journal event -> FocusTimer method that replays it
+_REPLAY = {"start": "start", "resume": "start", "pause": "pause", "complete": "finish"}
+
+
+@dataclass(frozen=True)
+class TimerSettings:
+    """The productivity_settings row, with the config defaults for a missing row or column"""
+    focus_duration: int = DEFAULT_FOCUS_DURATION
+    break_duration: int = DEFAULT_BREAK_DURATION
+    reminder_frequency: str = "daily"
+    notification_enabled: bool = False
+    daily_goal: int = DEFAULT_DAILY_GOAL
+    reminder_time: str = DEFAULT_REMINDER_TIME
+
+    def phase_minutes(self, phase):
+        if phase == FOCUS:
+            return self.focus_duration
+        if phase == SHORT_BREAK:
+            return self.break_duration
+        if phase == LONG_BREAK:
+            return self.break_duration * LONG_BREAK_MULTIPLIER
+        raise ValueError(f"unknown timer phase {phase!r}")
+
+
+# (write generation, settings) for the last read
+_cached = None
+_cache_lock = threading.Lock()
+
+
+def load_settings():
+    """
+    The current TimerSettings, read at most once per committed write.
+
+    The cache is keyed on db.write_generation(), so saving settings anywhere
+    through the pool is picked up on the next call.
+    """
+    global _cached
+    generation = write_generation()
+    with _cache_lock:
+        if _cached is not None and _cached[0] == generation:
+            return _cached[1]
+
+    conn = connect()
+    row = conn.execute(_SETTINGS_SQL, (_SETTINGS_USER,)).fetchone()
+    conn.close()
+
+    defaults = TimerSettings()
+    if row is None:
+        settings = defaults
+    else:
+        # NULL columns fall back to the defaults
+        values = [default if value is None else value
+                  for value, default in zip(row, (defaults.focus_duration, defaults.break_duration,
+                                                  defaults.reminder_frequency, defaults.notification_enabled,
+                                                  defaults.daily_goal, defaults.reminder_time))]
+        values[3] = bool(values[3])
+        settings = TimerSettings(*values)
+
+    with _cache_lock:
+        _cached = (generation, settings)
+    return settings
+
+
+def save_timer_settings(**changes):
+    """
+    Update the named TimerSettings fields, creating the settings row if there is none.
+
+    Returns the settings as saved.
+    """
+    unknown = set(changes) - set(TimerSettings.__dataclass_fields__)
+    if unknown:
+        raise ValueError(f"unknown timer settings: {', '.join(sorted(unknown))}")
+    if not changes:
+        return load_settings()
+
+    columns = list(changes)
+    values = [changes[column] for column in columns]
+    with transaction() as conn:
+        cursor = conn.execute(
+            f"UPDATE productivity_settings SET {', '.join(f'{column} = ?' for column in columns)} WHERE user_id = ?",
+            values + [_SETTINGS_USER])
+        if cursor.rowcount == 0:
+            row = {**TimerSettings().__dict__, **changes}
+            conn.execute(f"""
+                INSERT INTO productivity_settings (user_id, {', '.join(row)})
+                VALUES (?, {', '.join('?' for _ in row)})
+            """, [_SETTINGS_USER] + list(row.values()))
+    return load_settings()
+
+
+def recent_sessions(limit=5):
+    """(date, topic, minutes) for the latest study_log entries, newest first"""
+    conn = connect()
+    rows = conn.execute(_RECENT_SESSIONS_SQL, (limit,)).fetchall()
+    conn.close()
+    return rows
+
+
+def today_minutes(today=None):
+    """Minutes studied today, from the daily rollup"""
+    today = today or datetime.now().date()
+    conn = connect()
+    minutes = conn.execute(_TODAY_MINUTES_SQL, (today.strftime('%Y-%m-%d'),)).fetchone()[0]
+    conn.close()
+    return minutes or 0
+
+
+@dataclass
+class FocusTimer:
+    """
+    One Pomodoro countdown, kept in session state between reruns.
+
+    idle -> running <-> paused -> completed, and reset() returns to idle from
+    anywhere. The phase can only change while nothing is running. Times are
+    epoch seconds so the timer keeps counting while the page is not rerun.
+    """
+    phase: str = FOCUS
+    duration_seconds: int = DEFAULT_FOCUS_DURATION * 60
+    state: str = IDLE
+    topic: str = ""
+    subtopic: str = ""
+    session_id: str = None          # journal key, set when the session starts
+    first_started_at: float = None  # when the session was first started
+    started_at: float = None        # when the current run started
+    ended_at: float = None          # when the session completed
+    elapsed_before: float = 0       # seconds run before the last pause
+    saved: bool = False
+
+    def _require(self, action):
+        if self.state not in _TRANSITIONS[action]:
+            raise ValueError(f"cannot {action.replace('_', ' ')} a {self.state} timer")
+
+    def elapsed(self, now=None):
+        """Seconds counted so far, capped at the duration"""
+        elapsed = self.elapsed_before
+        if self.state == RUNNING:
+            elapsed += (now or time.time()) - self.started_at
+        return min(elapsed, self.duration_seconds)
+
+    def remaining(self, now=None):
+        return self.duration_seconds - self.elapsed(now)
+
+    def end_time(self):
+        """Epoch seconds at which a running timer reaches zero"""
+        return self.started_at + self.duration_seconds - self.elapsed_before if self.state == RUNNING else None
+
+    def start(self, now=None):
+        """Start from idle or resume from paused"""
+        self._require("start")
+        now = now or time.time()
+        if self.state == IDLE:
+            self.session_id = self.session_id or uuid.uuid4().hex
+            self.first_started_at = now
+        self.started_at = now
+        self.state = RUNNING
+
+    def pause(self, now=None):
+        self._require("pause")
+        self.elapsed_before = self.elapsed(now)
+        self.started_at = None
+        self.state = PAUSED
+
+    def finish(self, now=None):
+        """Complete the session now, possibly before the time is up"""
+        self._require("finish")
+        now = now or time.time()
+        self.elapsed_before = self.elapsed(now)
+        self.started_at = None
+        self.ended_at = now
+        self.state = COMPLETED
+
+    def reset(self):
+        """Back to idle for the same phase, discarding the time counted"""
+        self.state = IDLE
+        self.session_id = None
+        self.first_started_at = self.started_at = self.ended_at = None
+        self.elapsed_before = 0
+        self.saved = False
+
+    def set_phase(self, phase, settings):
+        """Switch phase, taking its duration from `settings`"""
+        self._require("set_phase")
+        self.phase = phase
+        self.duration_seconds = settings.phase_minutes(phase) * 60
+        self.reset()
+
+    def save(self):
+        """
+        Log a completed focus session; returns the minutes saved.
+
+        Safe to call on every rerun: a session is saved once, breaks and
+        sessions under a minute are not saved at all. Saves are keyed on the
+        session id, so a session saved again after a restart is not counted twice.
+        """
+        if self.state != COMPLETED or self.saved:
+            return 0
+        minutes = int(self.elapsed_before // 60)
+        if self.phase != FOCUS or minutes <= 0:
+            self.saved = True
+            return 0
+        started = datetime.fromtimestamp(self.first_started_at) if self.first_started_at else None
+        record_focus_session(self.topic, self.subtopic, minutes, started, datetime.fromtimestamp(self.ended_at),
+                             session_id=self.session_id)
+        # Only a write that went through counts; a failed one is retried on the next call
+        self.saved = True
+        return minutes
+
+
+def _journal(session_id, event, at, timer=None):
+    details = (timer.phase, timer.duration_seconds, timer.topic, timer.subtopic) if timer else (None,) * 4
+    with transaction() as conn:
+        conn.execute(_JOURNAL_SQL, (session_id, event, at) + details)
+
+
+def advance(timer, action, now=None):
+    """
+    Apply 'start', 'pause', 'finish' or 'reset' to `timer` and append it to the journal.
+
+    Resetting a timer that never started, or one whose session already
+    completed, is not journaled.
+    """
+    now = now or time.time()
+    event = {"start": "resume" if timer.state == PAUSED else "start", "finish": "complete"}.get(action, action)
+    if action == "reset":
+        session_id, state = timer.session_id, timer.state
+        timer.reset()
+        if session_id is not None and state != COMPLETED:
+            _journal(session_id, event, now)
+        return
+    getattr(timer, action)(now)
+    _journal(timer.session_id, event, now, timer)
+
+
+def check_timer(timer, now=None):
+    """
+    Complete a running timer whose time is up, as of the moment it reached zero.
+
+    Returns True when it did; the session still has to be saved.
+    """
+    now = now or time.time()
+    if timer.state != RUNNING or timer.remaining(now) > 0:
+        return False
+    advance(timer, "finish", min(now, timer.end_time()))
+    return True
+
+
+def replay(session_id, events):
+    """Rebuild a session's FocusTimer from its (event, at, phase, duration, topic, subtopic) journal rows"""
+    timer = None
+    for event, at, phase, duration_seconds, topic, subtopic in events:
+        if event == "start":
+            timer = FocusTimer(phase=phase, duration_seconds=duration_seconds, topic=topic or "",
+                               subtopic=subtopic or "", session_id=session_id)
+        if timer is None:
+            continue
+        if event == "reset":
+            return None
+        getattr(timer, _REPLAY[event])(at)
+    return timer
+
+
+def recover_timer(now=None):
+    """
+    The timer of the last journaled session if it is still in progress, else None.
+
+    A session that ran out while nobody was watching, or that completed
+    without being saved (a crash between the two), is completed and saved
+    here; the save is idempotent, so this is safe to call on every load.
+    """
+    conn = connect()
+    row = conn.execute(_LATEST_SESSION_SQL).fetchone()
+    events = conn.execute(_SESSION_EVENTS_SQL, row).fetchall() if row else []
+    conn.close()
+
+    timer = replay(row[0], events) if row else None
+    if timer is None:
+        return None
+    check_timer(timer, now)
+    if timer.state == COMPLETED:
+        timer.save()
+        return None
+    return timer
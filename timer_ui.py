@@ -0,0 +1,193 @@
+import os
+import time
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from timer_engine import (FOCUS, IDLE, COMPLETED, PHASES, RUNNING, LONG_BREAK, SHORT_BREAK, TIMER_TOPICS, FocusTimer,
+                          advance, check_timer, recent_sessions, recover_timer, save_timer_settings,
+                          today_minutes)
+
+# Countdown display served from timer_component/, with no external build step
+_countdown = components.declare_component(
+    "focus_countdown", path=os.path.join(os.path.dirname(os.path.abspath(__file__)), "timer_component"))
+
+# A completion reported by the browser is accepted this far ahead of the server's clock
+CLOCK_SKEW_SECONDS = 2
+
+# Fragments (Streamlit 1.33+) let the timer panel rerun on its own
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", lambda func: func)
+
+_PHASE_MESSAGES = {
+    SHORT_BREAK: "Take a short break. Stretch, hydrate, and relax your eyes.",
+    LONG_BREAK: "Take a longer break. Get up, move around, and refresh your mind.",
+}
+
+
+def timer_state(settings):
+    """The session's FocusTimer, picked up from the journal or created on first use"""
+    if "focus_timer" not in st.session_state:
+        # A reload or restart carries on with the session still in progress
+        st.session_state.focus_timer = recover_timer() or FocusTimer(duration_seconds=settings.focus_duration * 60)
+    return st.session_state.focus_timer
+
+
+def _save_completed(timer):
+    """Save a completed focus session once, leaving a message for the panel to show"""
+    try:
+        minutes = timer.save()
+        if minutes:
+            st.session_state.timer_message = ("success", f"Saved {minutes} minutes of study on {timer.topic}")
+    except Exception as e:
+        st.session_state.timer_message = ("error", f"Error saving timer session: {str(e)}")
+
+
+def _settled(timer):
+    """Nothing is running and nothing is waiting to be saved"""
+    return timer.state == IDLE or (timer.state == COMPLETED and timer.saved)
+
+
+def _start():
+    timer = st.session_state.focus_timer
+    # Starting again after a completed session begins a fresh one, once the
+    # completed one is saved
+    if timer.state == COMPLETED:
+        _save_completed(timer)
+        if not timer.saved:
+            return
+        timer.reset()
+    advance(timer, "start")
+
+
+def _pause():
+    advance(st.session_state.focus_timer, "pause")
+
+
+def _reset():
+    advance(st.session_state.focus_timer, "reset")
+
+
+def _complete():
+    timer = st.session_state.focus_timer
+    advance(timer, "finish")
+    _save_completed(timer)
+    # A failed save leaves the timer completed, so the next rerun retries it
+    if timer.saved:
+        timer.reset()
+
+
+def countdown(run, remaining_seconds, duration_seconds, label, notify=False, compact=False, key=None):
+    """
+    Countdown that ticks in the browser while `run` is set (None shows it stopped).
+
+    Returns True once the browser reports that `run` reached zero; the server
+    still has to check its own clock, allowing CLOCK_SKEW_SECONDS.
+    """
+    event = _countdown(phase=label, running=run is not None, run=run, remaining_seconds=remaining_seconds,
+                       duration_seconds=duration_seconds, notify=notify, compact=compact, key=key, default=None)
+    return run is not None and bool(event) and event.get("completed") == run
+
+
+def _run_id(timer):
+    """Identifies the current run, so a completion reported for an earlier run is ignored"""
+    return f"{timer.started_at:.6f}" if timer.state == RUNNING else None
+
+
+@_fragment
+def show_timer_controls(settings):
+    """
+    Phase picker, countdown and Start/Pause/Reset/Complete for the session's timer.
+
+    The countdown component ticks in the browser and reports back once when
+    it reaches zero; that rerun completes and saves the session. Where
+    Streamlit supports fragments only this panel is rerun.
+    """
+    timer = timer_state(settings)
+
+    phase = st.radio("Timer Type", PHASES, index=PHASES.index(timer.phase),
+                     disabled=not _settled(timer))
+    # Idle timers follow the picker and any change to the durations
+    if _settled(timer) and (
+            phase != timer.phase or (timer.state == IDLE and settings.phase_minutes(phase) * 60 != timer.duration_seconds)):
+        timer.set_phase(phase, settings)
+
+    if timer.phase == FOCUS:
+        # A session keeps the topic it was started with
+        locked = timer.state not in (IDLE, COMPLETED)
+        topic = st.selectbox("What are you working on?", TIMER_TOPICS, disabled=locked,
+                             index=TIMER_TOPICS.index(timer.topic) if timer.topic in TIMER_TOPICS else 0)
+        subtopic = st.text_input("Subtopic (optional)", value=timer.subtopic, disabled=locked)
+        if not locked:
+            timer.topic, timer.subtopic = topic, subtopic
+
+    # A running timer whose time ran out while nobody was watching completes now
+    check_timer(timer)
+
+    if countdown(_run_id(timer), timer.remaining(), timer.duration_seconds, timer.phase,
+                 notify=settings.notification_enabled, key="focus_countdown"):
+        # The browser and server clocks differ slightly; trust the browser's zero
+        check_timer(timer, time.time() + CLOCK_SKEW_SECONDS)
+    _save_completed(timer)
+
+    message = st.session_state.pop("timer_message", None)
+    if message:
+        getattr(st, message[0])(message[1])
+
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        if timer.state == RUNNING:
+            st.button("Pause", on_click=_pause)
+        else:
+            st.button("Start", on_click=_start)
+    with col2:
+        st.button("Reset", on_click=_reset)
+    with col3:
+        if timer.phase == FOCUS:
+            st.button("Complete", on_click=_complete, disabled=timer.state in (IDLE, COMPLETED))
+
+    if timer.phase == FOCUS:
+        st.info(f"Focus on your {timer.topic} studies. Stay concentrated!")
+    else:
+        st.success(_PHASE_MESSAGES[timer.phase])
+
+
+def show_notification_toggle(settings):
+    """Checkbox for completion notifications, saved as soon as it changes"""
+    enabled = st.checkbox("Enable notifications when timer completes", value=settings.notification_enabled)
+    if enabled != settings.notification_enabled:
+        save_timer_settings(notification_enabled=enabled)
+
+
+def show_settings_form(settings, daily_goal=False):
+    """Focus and break durations, optionally with the daily goal"""
+    with st.form("timer_settings"):
+        changes = {
+            "focus_duration": st.number_input("Focus Duration (minutes)", min_value=1, max_value=60,
+                                              value=settings.focus_duration),
+            "break_duration": st.number_input("Break Duration (minutes)", min_value=1, max_value=30,
+                                              value=settings.break_duration),
+        }
+        if daily_goal:
+            changes["daily_goal"] = st.number_input("Daily Goal (minutes)", min_value=15, max_value=720,
+                                                    value=settings.daily_goal)
+
+        if st.form_submit_button("Update Settings"):
+            save_timer_settings(**changes)
+            st.success("Settings updated!")
+            st.rerun()
+
+
+def show_recent_sessions(unit="minutes", empty_message="No study sessions recorded yet."):
+    sessions = recent_sessions()
+    if sessions:
+        for date, topic, time_spent in sessions:
+            st.write(f"{date} - {topic}: {time_spent} {unit}")
+    else:
+        st.info(empty_message)
+
+
+def show_daily_goal(settings, unit="minutes"):
+    minutes = today_minutes()
+    progress = min(1.0, minutes / settings.daily_goal) if settings.daily_goal else 1.0
+    st.progress(progress)
+    st.write(f"{minutes} / {settings.daily_goal} {unit} ({int(progress * 100)}%)")
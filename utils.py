@@ -1,47 +1,40 @@
+import json
 import sqlite3
-from datetime import datetime
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 import os
 
-def save_lecture_notes(title, notes, date):
-    conn = sqlite3.connect('cat_prep.db')
-    c = conn.cursor()
+from config import BULK_CHUNK_SIZE, CAT_SECTIONS, DIFFICULTY_LEVELS
+from db import connect, transaction
+from rollups import record_study_day, rebuild_study_streak, streak_as_of, sync_note_tags
 
-    # Check if notes table exists and has the correct schema
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='notes'")
-    if c.fetchone() is None:
-        # Create notes table if it doesn't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS notes
-                     (date TEXT, title TEXT, content TEXT, tags TEXT)''')
-        conn.commit()
+_SECTION_AVERAGE_SQL = "SELECT AVG(score) FROM progress WHERE section = ?"
+
+# Titles travel as one JSON array; lectures already in the requested state are not touched
+_SET_WATCHED_SQL = """
+    UPDATE videos
+    SET watched = ?
+    WHERE title IN (SELECT value FROM json_each(?)) AND watched IS NOT ?
+"""
+
+def save_lecture_notes(title, notes, date, tags='lecture'):
+    conn = connect()
+    c = conn.cursor()
 
     # Insert the lecture note with provided date
     c.execute("""
         INSERT INTO notes (date, title, content, tags)
         VALUES (?, ?, ?, ?)
-    """, (date.strftime('%Y-%m-%d') if hasattr(date, 'strftime') else str(date), title, notes, 'lecture'))
+    """, (date.strftime('%Y-%m-%d') if hasattr(date, 'strftime') else str(date), title, notes, tags))
+    sync_note_tags(c, c.lastrowid, tags)
     conn.commit()
     conn.close()
 
 def save_flashcard(word, definition, usage, category):
-    conn = sqlite3.connect('cat_prep.db')
+    conn = connect()
     c = conn.cursor()
 
-    # Check if flashcards table exists and has the correct schema
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='flashcards'")
-    if c.fetchone() is None:
-        # Create flashcards table if it doesn't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS flashcards
-                     (word TEXT, definition TEXT, usage TEXT, category TEXT, mastered BOOLEAN, date TEXT)''')
-        conn.commit()
-    else:
-        # Check if the date column exists
-        c.execute("PRAGMA table_info(flashcards)")
-        columns = [info[1] for info in c.fetchall()]
-        if 'date' not in columns:
-            # Add the date column if it doesn't exist
-            c.execute("ALTER TABLE flashcards ADD COLUMN date TEXT")
-            conn.commit()
-
     # Insert the flashcard with current date
     c.execute("""
         INSERT INTO flashcards (word, definition, usage, category, mastered, date)
@@ -51,17 +44,9 @@ def save_flashcard(word, definition, usage, category):
     conn.close()
 
 def save_question(question, answer, topic, difficulty):
-    conn = sqlite3.connect('cat_prep.db')
+    conn = connect()
     c = conn.cursor()
 
-    # Check if questions table exists and has the correct schema
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='questions'")
-    if c.fetchone() is None:
-        # Create questions table if it doesn't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS questions
-                     (date TEXT, question TEXT, answer TEXT, topic TEXT, difficulty TEXT, correct INTEGER DEFAULT 0)''')
-        conn.commit()
-
     # Insert the question with current date
     c.execute("""
         INSERT INTO questions (date, question, answer, topic, difficulty, correct)
@@ -71,73 +56,38 @@ def save_question(question, answer, topic, difficulty):
     conn.close()
 
 def save_notes(title, content, tags):
-    conn = sqlite3.connect('cat_prep.db')
+    conn = connect()
     c = conn.cursor()
 
-    # Check if notes table exists and has the correct schema
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='notes'")
-    if c.fetchone() is None:
-        # Create notes table if it doesn't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS notes
-                     (date TEXT, title TEXT, content TEXT, tags TEXT)''')
-        conn.commit()
-
     # Insert the note with current date
     c.execute("""
         INSERT INTO notes (date, title, content, tags)
         VALUES (?, ?, ?, ?)
     """, (datetime.now().strftime('%Y-%m-%d'), title, content, tags))
+    sync_note_tags(c, c.lastrowid, tags)
     conn.commit()
     conn.close()
 
 def save_study_session(topic, subtopic, time_spent, notes=""):
-    conn = sqlite3.connect('cat_prep.db')
+    conn = connect()
     c = conn.cursor()
 
-    # Check if study_log table exists and has the correct schema
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='study_log'")
-    if c.fetchone() is None:
-        # Create study_log table if it doesn't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS study_log
-                     (date TEXT, topic TEXT, subtopic TEXT, time_spent INTEGER, notes TEXT)''')
-        conn.commit()
-    else:
-        # Check if the subtopic column exists
-        c.execute("PRAGMA table_info(study_log)")
-        columns = [info[1] for info in c.fetchall()]
-        if 'subtopic' not in columns:
-            # Add the subtopic column if it doesn't exist
-            c.execute("ALTER TABLE study_log ADD COLUMN subtopic TEXT")
-            conn.commit()
-
     # Insert the study session with current date
+    today = datetime.now().strftime('%Y-%m-%d')
     c.execute("""
         INSERT INTO study_log (date, topic, subtopic, time_spent, notes)
         VALUES (?, ?, ?, ?, ?)
-    """, (datetime.now().strftime('%Y-%m-%d'), topic, subtopic, time_spent, notes))
+    """, (today, topic, subtopic, time_spent, notes))
+
+    # Advance the streak in the same transaction
+    record_study_day(c, today)
     conn.commit()
     conn.close()
 
 def save_progress(section, topic, subtopic, score):
-    conn = sqlite3.connect('cat_prep.db')
+    conn = connect()
     c = conn.cursor()
 
-    # Check if progress table exists and has the correct schema
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='progress'")
-    if c.fetchone() is None:
-        # Create progress table if it doesn't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS progress
-                     (date TEXT, section TEXT, topic TEXT, subtopic TEXT, score REAL)''')
-        conn.commit()
-    else:
-        # Check if the subtopic column exists
-        c.execute("PRAGMA table_info(progress)")
-        columns = [info[1] for info in c.fetchall()]
-        if 'subtopic' not in columns:
-            # Add the subtopic column if it doesn't exist
-            c.execute("ALTER TABLE progress ADD COLUMN subtopic TEXT")
-            conn.commit()
-
     # Insert the progress with current date
     c.execute("""
         INSERT INTO progress (date, section, topic, subtopic, score)
@@ -147,28 +97,9 @@ def save_progress(section, topic, subtopic, score):
     conn.close()
 
 def save_settings(daily_goal, reminder_time):
-    conn = sqlite3.connect('cat_prep.db')
+    conn = connect()
     c = conn.cursor()
 
-    # Check if productivity_settings table exists
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='productivity_settings'")
-    if c.fetchone() is None:
-        # Create productivity_settings table if it doesn't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS productivity_settings
-                     (user_id TEXT, focus_duration INTEGER, break_duration INTEGER,
-                      reminder_frequency TEXT, notification_enabled BOOLEAN,
-                      daily_goal INTEGER, reminder_time TEXT)''')
-        conn.commit()
-    else:
-        # Check if the columns exist
-        c.execute("PRAGMA table_info(productivity_settings)")
-        columns = [info[1] for info in c.fetchall()]
-        if 'daily_goal' not in columns:
-            c.execute("ALTER TABLE productivity_settings ADD COLUMN daily_goal INTEGER")
-        if 'reminder_time' not in columns:
-            c.execute("ALTER TABLE productivity_settings ADD COLUMN reminder_time TEXT")
-        conn.commit()
-
     # Check if default user exists
     c.execute("SELECT * FROM productivity_settings WHERE user_id = ?", ("default",))
     if c.fetchone() is None:
@@ -190,18 +121,9 @@ def save_settings(daily_goal, reminder_time):
     conn.close()
 
 def save_timer_session(start_time, end_time, duration, completed, topic):
-    conn = sqlite3.connect('cat_prep.db')
+    conn = connect()
     c = conn.cursor()
 
-    # Check if timer_logs table exists
-    c.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='timer_logs'")
-    if c.fetchone() is None:
-        # Create timer_logs table if it doesn't exist
-        c.execute('''CREATE TABLE IF NOT EXISTS timer_logs
-                     (date TEXT, start_time TEXT, end_time TEXT, duration INTEGER,
-                      completed BOOLEAN, topic TEXT)''')
-        conn.commit()
-
     # Insert the timer session
     c.execute("""
         INSERT INTO timer_logs (date, start_time, end_time, duration, completed, topic)
@@ -217,11 +139,78 @@ def save_timer_session(start_time, end_time, duration, completed, topic):
     conn.commit()
     conn.close()
 
+def record_focus_sessions(sessions):
+    """
+    Log focus sessions to study_log and timer_logs, all in one transaction
+
+    Sessions are dicts or tuples of (topic, subtopic, minutes, start_time,
+    end_time, completed, session_id). end_time defaults to now, start_time to
+    `minutes` before it and completed to true; each row is dated by its
+    end_time, so sessions caught up later land on the day they happened. A
+    session whose session_id is already logged is not written again.
+
+    Returns (study_log id, timer_logs rowid) pairs in the order given.
+    """
+    def normalise(row):
+        minutes = _int(_field(row, "minutes", 2), "minutes", minimum=1)
+        end_time = _timestamp(_field(row, "end_time", 4), "end_time") or datetime.now()
+        start_time = _timestamp(_field(row, "start_time", 3), "start_time") or end_time - timedelta(minutes=minutes)
+        completed = _field(row, "completed", 5)
+        return (
+            _text(_field(row, "topic", 0), "topic"),
+            _text(_field(row, "subtopic", 1), "subtopic", required=False),
+            minutes,
+            start_time,
+            end_time,
+            1 if completed is None else _flag(completed, "completed"),
+            _text(_field(row, "session_id", 6), "session_id", required=False) or None,
+        )
+
+    ids, days = [], set()
+    with transaction() as conn:
+        c = conn.cursor()
+        for topic, subtopic, minutes, start_time, end_time, completed, session_id in _validate_rows(sessions, normalise):
+            day = end_time.strftime('%Y-%m-%d')
+            c.execute("""
+                INSERT INTO study_log (date, topic, subtopic, time_spent, notes, session_id)
+                VALUES (?, ?, ?, ?, '', ?)
+                ON CONFLICT DO NOTHING
+            """, (day, topic, subtopic, minutes, session_id))
+            if c.rowcount:
+                study_id = c.lastrowid
+                days.add(day)
+            else:
+                study_id = c.execute("SELECT id FROM study_log WHERE session_id = ?", (session_id,)).fetchone()[0]
+
+            c.execute("""
+                INSERT INTO timer_logs (date, start_time, end_time, duration, completed, topic, session_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT DO NOTHING
+            """, (day, start_time.strftime('%H:%M:%S'), end_time.strftime('%H:%M:%S'), minutes * 60, completed,
+                  topic, session_id))
+            if c.rowcount:
+                timer_id = c.lastrowid
+            else:
+                timer_id = c.execute("SELECT rowid FROM timer_logs WHERE session_id = ?", (session_id,)).fetchone()[0]
+            ids.append((study_id, timer_id))
+
+        # Advance the streak with the sessions; a catch-up batch can fill gaps
+        # anywhere in the history, so it is recomputed once instead
+        if len(days) > 1:
+            rebuild_study_streak(c)
+        elif days:
+            record_study_day(c, days.pop())
+    return ids
+
+def record_focus_session(topic, subtopic, minutes, start_time=None, end_time=None, completed=True, session_id=None):
+    """Log one focus session to study_log and timer_logs; returns (study_log id, timer_logs rowid)"""
+    return record_focus_sessions([(topic, subtopic, minutes, start_time, end_time, completed, session_id)])[0]
+
 def get_recent_activities(limit=5):
     """
     Get recent activities across all tables (notes, flashcards, questions, study_log)
     """
-    conn = sqlite3.connect('cat_prep.db')
+    conn = connect()
     c = conn.cursor()
 
     activities = []
@@ -287,15 +276,11 @@ def get_section_progress(section):
     """
     Get the average progress score for a specific section
     """
-    conn = sqlite3.connect('cat_prep.db')
+    conn = connect()
     c = conn.cursor()
 
     try:
-        c.execute("""
-            SELECT AVG(score)
-            FROM progress
-            WHERE section = ?
-        """, (section,))
+        c.execute(_SECTION_AVERAGE_SQL, (section,))
         result = c.fetchone()
         avg_score = result[0] if result and result[0] is not None else 0
     except sqlite3.OperationalError:
@@ -304,19 +289,38 @@ def get_section_progress(section):
     conn.close()
     return avg_score
 
+def get_study_streak():
+    """
+    Get (current streak, longest streak, last study date) from the persisted state
+
+    The current streak only counts while the last study day is today or
+    yesterday; after a missed day it reads as 0 until the next session.
+    """
+    conn = connect()
+    c = conn.cursor()
+
+    c.execute("SELECT current_streak, longest_streak, last_study_date FROM study_streak WHERE id = 1")
+    row = c.fetchone()
+    conn.close()
+
+    if not row:
+        return 0, 0, None
+    current_streak, longest_streak, last_study_date = row
+    return streak_as_of(current_streak, last_study_date), longest_streak, last_study_date
+
 def get_study_time_distribution():
     """
     Get the distribution of study time across different topics
     """
-    conn = sqlite3.connect('cat_prep.db')
+    conn = connect()
     c = conn.cursor()
 
     distribution = {}
 
     try:
         c.execute("""
-            SELECT topic, SUM(time_spent)
-            FROM study_log
+            SELECT topic, SUM(total_minutes)
+            FROM daily_study_rollup
             GROUP BY topic
         """)
         results = c.fetchall()
@@ -329,40 +333,267 @@ def get_study_time_distribution():
     conn.close()
     return distribution
 
-def mark_flashcard_mastery(word, mastered):
+def set_lectures_watched(titles, watched):
     """
-    Update the mastery status of a flashcard
+    Mark many lectures watched or unwatched by title in one statement
+
+    The titles travel as a single JSON parameter and are matched through the
+    unique title index; lectures already in the requested state are left
+    alone. Returns the number of lectures that changed.
     """
-    conn = sqlite3.connect('cat_prep.db')
-    c = conn.cursor()
+    with transaction() as conn:
+        cursor = conn.execute(_SET_WATCHED_SQL, (1 if watched else 0, json.dumps(list(titles), ensure_ascii=False),
+                                                 1 if watched else 0))
+        return cursor.rowcount
 
-    try:
-        c.execute("""
-            UPDATE flashcards
-            SET mastered = ?
-            WHERE word = ?
-        """, (mastered, word))
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass  # Table might not exist yet
+def record_question_attempt(question_id, correct, time_taken_seconds=None):
+    """
+    Record one attempt at a question by id
+
+    A trigger folds the attempt into question_accuracy_daily and makes it the
+    question's current correct/incorrect status.
+    """
+    conn = connect()
+    c = conn.cursor()
 
+    _insert_attempts(c, [(question_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 1 if correct else 0,
+                          int(time_taken_seconds) if time_taken_seconds else None)])
+    conn.commit()
     conn.close()
 
-def mark_question_correctness(question, correct):
+def _insert_attempts(c, attempts):
+    """Add (question_id, attempted_at, correct, time_taken_seconds) rows to question_attempts"""
+    c.executemany("""
+        INSERT INTO question_attempts (question_id, attempted_at, correct, time_taken_seconds)
+        VALUES (?, ?, ?, ?)
+    """, attempts)
+
+def mark_question_correctness(question_id, correct):
     """
-    Update the correctness status of a question
+    Update the correctness status of a question by id, recorded as a new attempt
     """
-    conn = sqlite3.connect('cat_prep.db')
-    c = conn.cursor()
+    record_question_attempt(question_id, correct)
+
+@dataclass(frozen=True)
+class ChunkReport:
+    """Timing for one committed chunk of a bulk write"""
+    index: int
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds > 0 else float("inf")
+
+def _field(row, name, position):
+    """Read a column from a dict row (e.g. csv.DictReader) or a positional tuple"""
+    if isinstance(row, dict):
+        return row.get(name)
+    return row[position] if position < len(row) else None
+
+def _text(value, name, required=True):
+    value = "" if value is None else str(value).strip()
+    if required and not value:
+        raise ValueError(f"{name} is required")
+    return value
+
+def _choice(value, name, choices):
+    value = _text(value, name)
+    if value not in choices:
+        raise ValueError(f"{name} must be one of {', '.join(choices)}, got {value!r}")
+    return value
+
+def _date(value, name="date"):
+    """Normalise a date to YYYY-MM-DD, defaulting to today when missing"""
+    if value is None or str(value).strip() == "":
+        return datetime.now().strftime('%Y-%m-%d')
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    try:
+        return datetime.strptime(str(value).strip(), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"{name} must be YYYY-MM-DD, got {value!r}") from None
+
+def _timestamp(value, name):
+    """A datetime from a datetime, epoch seconds or ISO string; None when missing"""
+    if value is None or str(value).strip() == "":
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value)
+    try:
+        return datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        raise ValueError(f"{name} must be a date and time, got {value!r}") from None
 
+def _int(value, name, minimum=None, default=None):
+    if (value is None or str(value).strip() == "") and default is not None:
+        return default
     try:
-        c.execute("""
-            UPDATE questions
-            SET correct = ?
-            WHERE question = ?
-        """, (1 if correct else 0, question))
-        conn.commit()
-    except sqlite3.OperationalError:
-        pass  # Table might not exist yet
+        number = int(float(str(value).strip()))
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}") from None
+    if minimum is not None and number < minimum:
+        raise ValueError(f"{name} must be at least {minimum}, got {number}")
+    return number
+
+def _flag(value, name):
+    if isinstance(value, bool):
+        return int(value)
+    text = "" if value is None else str(value).strip().lower()
+    if text in ("", "0", "false", "no"):
+        return 0
+    if text in ("1", "true", "yes"):
+        return 1
+    raise ValueError(f"{name} must be 0/1 or true/false, got {value!r}")
+
+def _validate_rows(rows, normalise):
+    """
+    Normalise every row before anything is written
 
-    conn.close()
+    Raises ValueError naming the first few bad rows (1-based) so a bad import
+    leaves the database untouched.
+    """
+    valid, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        try:
+            valid.append(normalise(row))
+        except (ValueError, TypeError, IndexError) as e:
+            errors.append(f"row {number}: {e}")
+    if errors:
+        more = f" (and {len(errors) - 5} more)" if len(errors) > 5 else ""
+        raise ValueError("; ".join(errors[:5]) + more)
+    return valid
+
+def _bulk_insert(sql, rows, chunk_size=None, on_chunk=None, dry_run=False, after_chunk=None):
+    """
+    executemany() the rows in chunks, one transaction per chunk
+
+    Returns one ChunkReport per committed chunk; on_chunk(report) is called as
+    each chunk lands so callers can show progress. after_chunk(cursor) runs
+    inside every chunk's transaction for derived state that must stay in step.
+    With dry_run the rows have already been validated and nothing is written.
+    """
+    if dry_run:
+        return []
+
+    chunk_size = chunk_size or BULK_CHUNK_SIZE
+    reports = []
+    for index, start in enumerate(range(0, len(rows), chunk_size), start=1):
+        chunk = rows[start:start + chunk_size]
+        started = time.perf_counter()
+        with transaction() as conn:
+            c = conn.cursor()
+            c.executemany(sql, chunk)
+            if after_chunk:
+                after_chunk(c)
+        report = ChunkReport(index, len(chunk), time.perf_counter() - started)
+        reports.append(report)
+        if on_chunk:
+            on_chunk(report)
+    return reports
+
+def save_questions_bulk(rows, chunk_size=None, on_chunk=None, dry_run=False):
+    """
+    Insert many questions at once
+
+    Rows are dicts or tuples of (question, answer, topic, difficulty, date, correct);
+    date defaults to today and correct to 0. A question imported as correct also
+    gets an attempt on its date, as record_question_attempt() would log. Returns
+    the list of ChunkReports (empty with dry_run, which only validates).
+    """
+    def normalise(row):
+        return (
+            _date(_field(row, "date", 4)),
+            _text(_field(row, "question", 0), "question"),
+            _text(_field(row, "answer", 1), "answer"),
+            _choice(_field(row, "topic", 2), "topic", CAT_SECTIONS),
+            _choice(_field(row, "difficulty", 3), "difficulty", DIFFICULTY_LEVELS),
+            _flag(_field(row, "correct", 5), "correct"),
+        )
+
+    return _bulk_insert("""
+        INSERT INTO questions (date, question, answer, topic, difficulty, correct)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, _validate_rows(rows, normalise), chunk_size, on_chunk, dry_run, after_chunk=_record_imported_attempts)
+
+def _record_imported_attempts(c):
+    """Log an attempt for each correct question in the chunk just inserted through `c`"""
+    # The chunk's rows took the consecutive ids ending at the current maximum
+    inserted = c.rowcount
+    first_id = c.execute("SELECT MAX(id) FROM questions").fetchone()[0] - inserted + 1
+    c.execute("SELECT id, date FROM questions WHERE id >= ? AND correct = 1", (first_id,))
+    _insert_attempts(c, [(question_id, f"{date} 00:00:00", 1, None) for question_id, date in c.fetchall()])
+
+def save_flashcards_bulk(rows, chunk_size=None, on_chunk=None, dry_run=False):
+    """
+    Insert many flashcards at once
+
+    Rows are dicts or tuples of (word, definition, usage, category, mastered, date);
+    mastered defaults to 0 and date to today. Returns the list of ChunkReports.
+    """
+    def normalise(row):
+        return (
+            _text(_field(row, "word", 0), "word"),
+            _text(_field(row, "definition", 1), "definition"),
+            _text(_field(row, "usage", 2), "usage", required=False),
+            _choice(_field(row, "category", 3), "category", CAT_SECTIONS),
+            _flag(_field(row, "mastered", 4), "mastered"),
+            _date(_field(row, "date", 5)),
+        )
+
+    return _bulk_insert("""
+        INSERT INTO flashcards (word, definition, usage, category, mastered, date)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, _validate_rows(rows, normalise), chunk_size, on_chunk, dry_run)
+
+def save_study_sessions_bulk(rows, chunk_size=None, on_chunk=None, dry_run=False):
+    """
+    Insert many study sessions at once, e.g. to back-fill past study logs
+
+    Rows are dicts or tuples of (date, topic, subtopic, time_spent, notes).
+    Returns the list of ChunkReports.
+    """
+    def normalise(row):
+        return (
+            _date(_field(row, "date", 0)),
+            _text(_field(row, "topic", 1), "topic"),
+            _text(_field(row, "subtopic", 2), "subtopic", required=False),
+            _int(_field(row, "time_spent", 3), "time_spent", minimum=1),
+            _text(_field(row, "notes", 4), "notes", required=False),
+        )
+
+    # Back-filled days can land anywhere in the history, so the streak is
+    # recomputed with each chunk rather than advanced day by day
+    return _bulk_insert("""
+        INSERT INTO study_log (date, topic, subtopic, time_spent, notes)
+        VALUES (?, ?, ?, ?, ?)
+    """, _validate_rows(rows, normalise), chunk_size, on_chunk, dry_run,
+                        after_chunk=rebuild_study_streak)
+
+def save_progress_bulk(rows, chunk_size=None, on_chunk=None, dry_run=False):
+    """
+    Insert many progress scores at once
+
+    Rows are dicts or tuples of (date, section, topic, subtopic, score).
+    Returns the list of ChunkReports.
+    """
+    def normalise(row):
+        score = _field(row, "score", 4)
+        try:
+            score = float(str(score).strip())
+        except ValueError:
+            raise ValueError(f"score must be a number, got {score!r}") from None
+        return (
+            _date(_field(row, "date", 0)),
+            _choice(_field(row, "section", 1), "section", CAT_SECTIONS),
+            _text(_field(row, "topic", 2), "topic"),
+            _text(_field(row, "subtopic", 3), "subtopic", required=False),
+            score,
+        )
+
+    return _bulk_insert("""
+        INSERT INTO progress (date, section, topic, subtopic, score)
+        VALUES (?, ?, ?, ?, ?)
+    """, _validate_rows(rows, normalise), chunk_size, on_chunk, dry_run)